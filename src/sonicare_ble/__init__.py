@@ -13,14 +13,26 @@ from sensor_state_data import (
     Units,
 )
 
-from .parser import SonicareBinarySensor, SonicareBluetoothDeviceData, SonicareSensor
+from .fleet import SonicareFleet
+from .parser import (
+    BrushingPolicy,
+    BrushingState,
+    Models,
+    SonicareBinarySensor,
+    SonicareBluetoothDeviceData,
+    SonicareSensor,
+)
 
 __version__ = "0.0.0"
 
 __all__ = [
+    "BrushingPolicy",
+    "BrushingState",
+    "Models",
     "SonicareSensor",
     "SonicareBinarySensor",
     "SonicareBluetoothDeviceData",
+    "SonicareFleet",
     "BinarySensorDeviceClass",
     "BinarySensorValue",
     "SensorDescription",
@@ -0,0 +1,78 @@
+"""Decide when a connection to a Sonicare toothbrush is likely to succeed."""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+
+from .const import MIN_CONNECT_RSSI, RSSI_SMOOTHING_FACTOR, RSSI_STALE_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceSignal:
+    rssi: float
+    last_seen: float
+
+
+class ConnectionAdmission:
+    """
+    Track a smoothed RSSI for each source (adapter or proxy) that hears a device.
+
+    Sources that have not heard the device recently are ignored, and a connection
+    is only admitted when the best remaining source is above the minimum RSSI.
+    """
+
+    def __init__(
+        self,
+        min_rssi: float = MIN_CONNECT_RSSI,
+        smoothing: float = RSSI_SMOOTHING_FACTOR,
+        stale_seconds: float = RSSI_STALE_SECONDS,
+    ) -> None:
+        self._min_rssi = min_rssi
+        self._smoothing = smoothing
+        self._stale_seconds = stale_seconds
+        self._signals: dict[str, SourceSignal] = {}
+
+    def update(self, source: str, rssi: int | None, now: float | None = None) -> None:
+        """Add an RSSI sample heard by a source."""
+        if rssi is None:
+            return
+        if now is None:
+            now = time.monotonic()
+        signal = self._signals.get(source)
+        if signal is None:
+            self._signals[source] = SourceSignal(rssi, now)
+            return
+        signal.rssi += self._smoothing * (rssi - signal.rssi)
+        signal.last_seen = now
+
+    def rssi(self, source: str) -> float | None:
+        """Return the smoothed RSSI for a source."""
+        signal = self._signals.get(source)
+        return None if signal is None else signal.rssi
+
+    def best_source(self, now: float | None = None) -> str | None:
+        """Return the source with the strongest recent signal."""
+        if now is None:
+            now = time.monotonic()
+        best: str | None = None
+        best_rssi = float("-inf")
+        for source, signal in self._signals.items():
+            if now - signal.last_seen > self._stale_seconds:
+                continue
+            if signal.rssi > best_rssi:
+                best, best_rssi = source, signal.rssi
+        return best
+
+    def connection_likely(self, now: float | None = None) -> bool:
+        """Return if a connection through the best source is likely to succeed."""
+        source = self.best_source(now)
+        if source is None:
+            return False
+        rssi = self._signals[source].rssi
+        if rssi < self._min_rssi:
+            _LOGGER.debug("Best source %s has rssi %.1f, below %s", source, rssi, self._min_rssi)
+            return False
+        return True
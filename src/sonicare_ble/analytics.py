@@ -0,0 +1,170 @@
+"""Columnar storage and fleet-wide aggregates for finished brushing sessions.
+
+Requires numpy, install with the ``analytics`` extra. Columns are plain numpy
+arrays, so ``columns()`` can be handed to ``pyarrow.table`` without copying.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from .parser import brush_head_percentage_left
+
+SECONDS_PER_DAY = 86400
+
+# Mode and strength value for models that do not report them
+UNKNOWN = -1
+
+COLUMNS = {
+    "device": np.int32,
+    "session_id": np.uint32,
+    "ended": np.float64,
+    "duration": np.float64,
+    "mode": np.int16,
+    "strength": np.int8,
+    "brush_head_usage": np.float64,
+    "brush_head_lifetime": np.float64,
+}
+
+
+@dataclass
+class BrushHeadWear:
+    """Per device brush head wear, indexed like ``devices``."""
+
+    devices: list[str]
+    percentage_left: npt.NDArray[np.float64]
+    wear_per_day: npt.NDArray[np.float64]
+    projected_replacement: npt.NDArray[np.float64]
+
+
+class SessionStore:
+    """Append-only columnar store of finished brushing sessions."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._size = 0
+        self._columns = {
+            name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS.items()
+        }
+        self._devices: list[str] = []
+        self._device_index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def devices(self) -> list[str]:
+        return self._devices
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._columns["device"])
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+
+    def append(
+        self,
+        address: str,
+        session_id: int,
+        ended: float,
+        duration: float,
+        mode: int | None,
+        strength: int | None,
+        brush_head_usage: float,
+        brush_head_lifetime: float,
+    ) -> None:
+        """Add one finished session."""
+        device = self._device_index.get(address)
+        if device is None:
+            device = self._device_index[address] = len(self._devices)
+            self._devices.append(address)
+        self._grow(self._size + 1)
+        row = {
+            "device": device,
+            "session_id": session_id,
+            "ended": ended,
+            "duration": duration,
+            "mode": UNKNOWN if mode is None else mode,
+            "strength": UNKNOWN if strength is None else strength,
+            "brush_head_usage": brush_head_usage,
+            "brush_head_lifetime": brush_head_lifetime,
+        }
+        for name, value in row.items():
+            self._columns[name][self._size] = value
+        self._size += 1
+
+    def columns(self) -> dict[str, npt.NDArray[np.generic]]:
+        """Return views of the filled part of every column."""
+        return {name: column[: self._size] for name, column in self._columns.items()}
+
+    def average_duration(self) -> float:
+        """Return the average session duration in seconds across the fleet."""
+        if not self._size:
+            return 0.0
+        return float(self._columns["duration"][: self._size].mean())
+
+    def mode_distribution(self) -> dict[int, int]:
+        """Return the number of sessions brushed in each mode."""
+        modes, counts = np.unique(self._columns["mode"][: self._size], return_counts=True)
+        return {int(mode): int(count) for mode, count in zip(modes, counts)}
+
+    def brush_head_wear(self) -> BrushHeadWear:
+        """
+        Return the remaining brush head life per device, the wear rate of the
+        current brush head and the projected replacement time (epoch seconds,
+        nan when no wear has been seen yet).
+
+        A drop in usage between sessions means the brush head was replaced, so
+        the wear rate only covers sessions since the last drop.
+        """
+        if not self._size:
+            empty = np.empty(0, dtype=np.float64)
+            return BrushHeadWear([], empty, empty.copy(), empty.copy())
+        columns = self.columns()
+        device = columns["device"]
+        ended = columns["ended"]
+        usage = columns["brush_head_usage"]
+        lifetime = columns["brush_head_lifetime"]
+
+        order = np.lexsort((ended, device))
+        sorted_device = device[order]
+        sorted_usage = usage[order]
+        device_start = np.r_[True, sorted_device[1:] != sorted_device[:-1]]
+        starts = np.flatnonzero(device_start)
+        ends = np.r_[starts[1:], len(order)] - 1
+        # Position of the first session on the current brush head for every row
+        head_start = device_start | np.r_[False, sorted_usage[1:] < sorted_usage[:-1]]
+        head_first = np.maximum.accumulate(np.where(head_start, np.arange(len(order)), 0))
+        first = order[head_first[ends]]
+        last = order[ends]
+
+        last_usage = usage[last]
+        last_lifetime = lifetime[last]
+        # One value per device, computed like the parser's sensor
+        percentage_left = np.fromiter(
+            map(brush_head_percentage_left, last_usage, last_lifetime),
+            dtype=np.float64,
+            count=len(last),
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            elapsed_days = (ended[last] - ended[first]) / SECONDS_PER_DAY
+            worn = usage[last] - usage[first]
+            wear_per_day = np.where((elapsed_days > 0) & (worn > 0), worn / elapsed_days, 0.0)
+            projected_replacement = np.where(
+                wear_per_day > 0,
+                ended[last]
+                + np.maximum(last_lifetime - last_usage, 0) / wear_per_day * SECONDS_PER_DAY,
+                np.nan,
+            )
+
+        return BrushHeadWear(
+            devices=[self._devices[index] for index in sorted_device[starts]],
+            percentage_left=percentage_left,
+            wear_per_day=wear_per_day,
+            projected_replacement=projected_replacement,
+        )
@@ -6,6 +6,9 @@ SONICARE_ADVERTISMENT_UUID = "477ea600-a260-11e4-ae37-0002a5d50001"
 SONICARE_STATE_SERVICE = "477ea600-a260-11e4-ae37-0002a5d50002"
 SONICARE_BRUSH_SERVICE = "477ea600-a260-11e4-ae37-0002a5d50006"
 
+# Advertised service uuids that identify a Sonicare toothbrush
+SONICARE_SERVICE_UUIDS = frozenset({SONICARE_ADVERTISMENT_UUID})
+
 # In Use
 CHARACTERISTIC_BATTERY = "00002a19-0000-1000-8000-00805f9b34fb"
 CHARACTERISTIC_MODEL = "00002a24-0000-1000-8000-00805f9b34fb"
@@ -36,3 +39,14 @@ CHAR_DICT = {
     "BRUSH_SERIAL_NUMBER": ("477ea600-a260-11e4-ae37-0002a5d54230", "brush_serial_number", "Toothbrush serial number"),
     "SESSION_ID": ("477ea600-a260-11e4-ae37-0002a5d54070", "current_session_id")
 }
+
+# Connection admission
+RSSI_SMOOTHING_FACTOR = 0.3
+MIN_CONNECT_RSSI = -85
+RSSI_STALE_SECONDS = 60
+MAX_DEFERRED_POLL_SECONDS = 300
+
+# Adaptive read plan
+READ_INTERVAL_MIN_SECONDS = 30
+READ_INTERVAL_MAX_SECONDS = 3600
+PREFETCH_SECONDS = 15
@@ -0,0 +1,59 @@
+"""Ingest advertisements for many Sonicare toothbrushes at once."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import Callable
+
+from home_assistant_bluetooth import BluetoothServiceInfo
+from sensor_state_data import SensorUpdate
+
+from .const import SONICARE_SERVICE_UUIDS
+from .parser import SonicareBluetoothDeviceData
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SonicareFleet:
+    """Keep one parser per address and update them from batches of advertisements."""
+
+    def __init__(
+        self,
+        parser_factory: Callable[[], SonicareBluetoothDeviceData] = SonicareBluetoothDeviceData,
+    ) -> None:
+        self._parser_factory = parser_factory
+        self._parsers: dict[str, SonicareBluetoothDeviceData] = {}
+
+    def __len__(self) -> int:
+        return len(self._parsers)
+
+    def parser(self, address: str) -> SonicareBluetoothDeviceData:
+        """Return the parser for an address, creating it on first use."""
+        parser = self._parsers.get(address)
+        if parser is None:
+            parser = self._parsers[address] = self._parser_factory()
+        return parser
+
+    def update_batch(
+        self, service_infos: Iterable[BluetoothServiceInfo]
+    ) -> dict[str, SensorUpdate]:
+        """
+        Update from a burst of advertisements and return one update per address.
+
+        Advertisements without a Sonicare service uuid are dropped up front and
+        only the latest advertisement seen for each address in the batch is parsed.
+        """
+        latest: dict[str, BluetoothServiceInfo] = {}
+        received = 0
+        for service_info in service_infos:
+            received += 1
+            if SONICARE_SERVICE_UUIDS.isdisjoint(service_info.service_uuids):
+                continue
+            latest[service_info.address] = service_info
+        _LOGGER.debug(
+            "Parsing batch of %s advertisements for %s devices", received, len(latest)
+        )
+        return {
+            address: self.parser(address).update(service_info)
+            for address, service_info in latest.items()
+        }
@@ -7,8 +7,10 @@ import time
 
 from dataclasses import dataclass
 from enum import Enum, auto
+from typing import TYPE_CHECKING, Callable
 
 from bleak import BLEDevice, BleakGATTCharacteristic
+from bleak.exc import BleakError
 from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
 from bluetooth_data_tools import short_address
 from bluetooth_sensor_state_data import BluetoothData
@@ -16,11 +18,13 @@ from home_assistant_bluetooth import BluetoothServiceInfo
 from sensor_state_data import SensorDeviceClass, SensorUpdate, Units
 from sensor_state_data.enum import StrEnum
 
+from .admission import ConnectionAdmission
+from .read_plan import ReadPlan
+from .status_table import StatusTableError
 from .const import (
     BRUSHING_UPDATE_INTERVAL_SECONDS,
-    CHARACTERISTIC_BATTERY,
+    MAX_DEFERRED_POLL_SECONDS,
     CHARACTERISTIC_BRUSHING_TIME,
-    CHARACTERISTIC_CURRENT_TIME,
     CHARACTERISTIC_STATE,
     NOT_BRUSHING_UPDATE_INTERVAL_SECONDS,
     TIMEOUT_RECENTLY_BRUSHING,
@@ -33,6 +37,11 @@ from .const import (
     CHAR_DICT
 )
 
+if TYPE_CHECKING:
+    from .analytics import SessionStore
+    from .status_table import StatusTableWriter
+    from .trace import TraceRecorder
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -55,6 +64,18 @@ class SonicareBinarySensor(StrEnum):
     BRUSHING = "brushing"
 
 
+class BrushingState(Enum):
+    IDLE = auto()
+    BRUSHING = auto()
+    RECENTLY_BRUSHED = auto()
+
+
+@dataclass
+class BrushingPolicy:
+    keep_connected: bool
+    poll_interval: float | None
+
+
 class Models(Enum):
     HX6340 = auto()
     HX992X = auto()
@@ -65,6 +86,7 @@ class Models(Enum):
 class ModelDescription:
     device_type: str
     modes: dict[int, str]
+    characteristics: frozenset[str]
 
 
 KIDS_MODES = {
@@ -79,30 +101,68 @@ EXPERT_CLEAN_MODES = {
 DIAMOND_CLEAN_MODES = EXPERT_CLEAN_MODES | {160: "white+"}
 PRESTIGE_MODES = DIAMOND_CLEAN_MODES | {210: "sensitive"}
 
-MODES = {
+# CHAR_DICT keys read during a poll
+POLL_CHARACTERISTICS = frozenset({
+    "STATE",
+    "BATTERY",
+    "CURRENT_TIME",
+    "SESSION_ID",
+    "BRUSH_SERIAL_NUMBER",
+    "BRUSH_USAGE",
+    "BRUSH_HEAD_LIFETIME",
+    "MODE",
+    "STRENGTH",
+    "BRUSHING_TIME",
+})
 
-}
 DEVICE_TYPES = {
     Models.HX6340: ModelDescription(
         device_type="HX6340",
-        modes=KIDS_MODES
+        modes=KIDS_MODES,
+        # Kids brushes have a single mode and no intensity setting
+        characteristics=POLL_CHARACTERISTICS - {"MODE", "STRENGTH"}
     ),
     Models.HX992X: ModelDescription(
         device_type="HX992X",
-        modes=DIAMOND_CLEAN_MODES
+        modes=DIAMOND_CLEAN_MODES,
+        characteristics=POLL_CHARACTERISTICS
     ),
     Models.HX9990: ModelDescription(
         device_type="HX9990",
-        modes=PRESTIGE_MODES
+        modes=PRESTIGE_MODES,
+        characteristics=POLL_CHARACTERISTICS
     )
 }
 
+# Used until the model has been detected
+DEFAULT_MODEL = Models.HX992X
+
 STRENGTH = {
     0: "low",
     1: "medium",
     2: "high"
 }
 
+BRUSHING_POLICIES = {
+    BrushingState.IDLE: BrushingPolicy(
+        keep_connected=False,
+        poll_interval=NOT_BRUSHING_UPDATE_INTERVAL_SECONDS
+    ),
+    # While brushing the connection stays open and updates arrive as notifications
+    BrushingState.BRUSHING: BrushingPolicy(
+        keep_connected=True,
+        poll_interval=None
+    ),
+    BrushingState.RECENTLY_BRUSHED: BrushingPolicy(
+        keep_connected=False,
+        poll_interval=BRUSHING_UPDATE_INTERVAL_SECONDS
+    ),
+}
+
+NOTIFY_CHARACTERISTICS = ("STATE", "BRUSHING_TIME", "MODE", "STRENGTH")
+
+STATE_RUN = 2
+
 STATES = {
     0: "off",
     1: "standby",
@@ -113,30 +173,239 @@ STATES = {
     7: "lightsout",
 }
 
-BYTES_TO_MODEL = {
-    b"\x062k": Models.HX6340,
-    b"\x2a24": Models.HX992X,
-    b"\x9999": Models.HX9990,
+# Prefixes of the model number string (0x2A24), most specific first
+MODEL_NUMBER_PREFIXES = (
+    ("HX999", Models.HX9990),
+    ("HX992", Models.HX992X),
+    ("HX63", Models.HX6340),
+)
+
+LOCAL_NAME_TO_MODEL = {
+    "Sonicare4Kids": Models.HX6340,
 }
 
 
+def model_from_model_number(model_number: str) -> Models | None:
+    """Return the model for a model number string, or None if it is not known."""
+    model_number = model_number.strip("\x00 ").upper()
+    for prefix, model in MODEL_NUMBER_PREFIXES:
+        if model_number.startswith(prefix):
+            return model
+    return None
+
+
+def brush_head_percentage_left(usage: float, lifetime: float) -> float:
+    """Return the percentage of brush head life left, 0 when the lifetime is unknown."""
+    if not lifetime > 0:
+        return 0.0
+    return min(max((lifetime - usage) / lifetime * 100, 0.0), 100.0)
+
+
 class SonicareBluetoothDeviceData(BluetoothData):
     """Data for Sonicare BLE sensors."""
 
-    def __init__(self) -> None:
-        # If this is True, we are currently brushing or were brushing as of the last advertisement data
-        self._brushing = False
+    def __init__(self, model: Models | None = None) -> None:
+        self._brushing_state = BrushingState.IDLE
         self._last_brush = 0.0
-        self._model = None
+        # Pass a previously detected model to skip detection on startup
+        self._model = model
+        self._model_number_read = False
+        self._address: str | None = None
+        self._described: tuple[str, Models | None] | None = None
         self._device = None
         self._client = None
         self._session = None
         self._notify_future: asyncio.Future[bytearray] | None = None
+        self._release_task: asyncio.Task[None] | None = None
+        self._polling = False
+        self._recorder: TraceRecorder | None = None
+        self._trace_poll: int | None = None
+        self._status_exporter: StatusTableWriter | None = None
+        self._session_store: SessionStore | None = None
+        # Latest values read or notified, stored with the session when brushing stops
+        self._brushing_time: int | None = None
+        self._mode_int: int | None = None
+        self._strength_int: int | None = None
+        self._serial_number: int | None = None
+        self._brush_head_usage: int | None = None
+        self._brush_head_lifetime: int | None = None
+        self._stored_session: int | None = None
+        self._clock: Callable[[], float] = time.monotonic
+        self._admission = ConnectionAdmission()
+        self._deferred_since: float | None = None
+        self._read_plan = ReadPlan(clock=self._clock)
         super().__init__()
 
+    def set_clock(self, clock: Callable[[], float]) -> None:
+        """Use another monotonic clock, for example the recorded time of a trace."""
+        self._clock = clock
+        self._read_plan.set_clock(clock)
+
+    def set_trace_recorder(self, recorder: TraceRecorder | None) -> None:
+        """Capture advertisements, GATT reads and notifications to a trace."""
+        self._recorder = recorder
+
+    def set_status_exporter(self, exporter: StatusTableWriter | None) -> None:
+        """Publish the latest decoded values to a shared status table."""
+        self._status_exporter = exporter
+
+    def set_session_store(self, store: SessionStore | None) -> None:
+        """Append every brushing session seen to finish to a columnar session store."""
+        self._session_store = store
+
+    def _store_session(self) -> None:
+        """Append the session that just finished, once per session id."""
+        if (
+            self._session_store is None
+            or self._address is None
+            or self._session is None
+            or self._brushing_time is None
+            or self._session == self._stored_session
+        ):
+            return
+        self._stored_session = self._session
+        self._session_store.append(
+            self._address,
+            self._session,
+            time.time(),
+            self._brushing_time,
+            self._mode_int,
+            self._strength_int,
+            float("nan") if self._brush_head_usage is None else self._brush_head_usage,
+            float("nan") if self._brush_head_lifetime is None else self._brush_head_lifetime,
+        )
+
+    def _export_status(self, **values: int | None) -> None:
+        if self._status_exporter is None or self._address is None:
+            return
+        try:
+            self._status_exporter.update(
+                self._address, brushing_state=self._brushing_state.value, **values
+            )
+        except StatusTableError as err:
+            # The table is optional, stop exporting rather than failing updates
+            _LOGGER.warning("Not exporting status of %s: %s", self._address, err)
+            self._status_exporter = None
+
+    @property
+    def model(self) -> Models | None:
+        """Return the detected model, or None if it has not been detected yet."""
+        return self._model
+
+    @property
+    def model_info(self) -> ModelDescription:
+        """Return the description of the detected model, or the default model."""
+        return DEVICE_TYPES[self._model or DEFAULT_MODEL]
+
+    def _set_model(self, model: Models) -> None:
+        """Cache the detected model and update the device info to match."""
+        _LOGGER.debug("Detected toothbrush model %s", model.name)
+        self._model = model
+        if self._address is not None:
+            self._set_device_info(self._address)
+
+    def _set_device_info(self, address: str) -> None:
+        self._described = (address, self._model)
+        model_info = self.model_info
+        self.set_device_type(model_info.device_type)
+        name = f"{model_info.device_type} {short_address(address)}"
+        self.set_device_name(name)
+        self.set_title(name)
+
+    def _supports(self, key: str) -> bool:
+        """Return if the model exposes the CHAR_DICT characteristic key."""
+        return key in self.model_info.characteristics
+
+    @property
+    def read_plan(self) -> ReadPlan:
+        """Return the adaptive read plan and its statistics."""
+        return self._read_plan
+
+    @property
+    def preferred_source(self) -> str | None:
+        """Return the source with the strongest recent signal to connect through."""
+        return self._admission.best_source(self._clock())
+
+    @property
+    def brushing_state(self) -> BrushingState:
+        """Return the current brushing state."""
+        return self._brushing_state
+
+    @property
+    def brushing_policy(self) -> BrushingPolicy:
+        """Return the connection and poll policy for the current brushing state."""
+        return BRUSHING_POLICIES[self._brushing_state]
+
+    def _set_brushing_state(self, new_state: BrushingState) -> None:
+        """Transition to a new brushing state and apply its connection policy."""
+        old_state = self._brushing_state
+        # The recently brushed window starts when brushing stops
+        if BrushingState.BRUSHING in (old_state, new_state):
+            self._last_brush = self._clock()
+        if new_state is old_state:
+            return
+        _LOGGER.debug("Brushing state changing from %s to %s", old_state.name, new_state.name)
+        self._brushing_state = new_state
+        self._export_status()
+        if new_state is BrushingState.BRUSHING:
+            self._brushing_time = None
+        elif old_state is BrushingState.BRUSHING:
+            self._store_session()
+        if not BRUSHING_POLICIES[new_state].keep_connected and self._client is not None:
+            client, self._client = self._client, None
+            # A poll in progress still reads on the client and disconnects it when done
+            if not self._polling:
+                self._release_task = asyncio.get_running_loop().create_task(client.disconnect())
+                self._release_task.add_done_callback(self._release_done)
+
+    def _release_done(self, task: asyncio.Task[None]) -> None:
+        """Log a failed disconnect of a connection that was held while brushing."""
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.debug("Failed to disconnect toothbrush: %s", task.exception())
+
+    def _update_brushing_state(self, state: int) -> None:
+        """Drive the brushing state machine from a raw toothbrush state value."""
+        if state == STATE_RUN:
+            self._set_brushing_state(BrushingState.BRUSHING)
+        elif self._brushing_state is BrushingState.BRUSHING:
+            self._set_brushing_state(BrushingState.RECENTLY_BRUSHED)
+        else:
+            self._expire_recently_brushed()
+
+    def _expire_recently_brushed(self) -> None:
+        """Fall back to idle once the recently brushed window has passed."""
+        if (
+            self._brushing_state is BrushingState.RECENTLY_BRUSHED
+            and self._clock() - self._last_brush > TIMEOUT_RECENTLY_BRUSHING
+        ):
+            self._set_brushing_state(BrushingState.IDLE)
+
+    def _disconnected(self, client: BleakClientWithServiceCache) -> None:
+        """Handle the toothbrush dropping a connection we were holding open."""
+        if client is not self._client:
+            return
+        _LOGGER.debug("Toothbrush disconnected while brushing, resuming polling")
+        self._client = None
+        if self._brushing_state is BrushingState.BRUSHING:
+            self._set_brushing_state(BrushingState.RECENTLY_BRUSHED)
+
+    async def _async_subscribe(self, client: BleakClientWithServiceCache) -> None:
+        """Hold the connection open and subscribe to brushing notifications."""
+        _LOGGER.debug("Toothbrush is running, subscribing to events")
+        for key in NOTIFY_CHARACTERISTICS:
+            if not self._supports(key):
+                continue
+            await client.start_notify(CHAR_DICT[key][0], self._notification_handler)
+        # Only hold the connection once every subscription is in place, and not
+        # if brushing stopped while subscribing, so a failed poll disconnects it
+        if self.brushing_policy.keep_connected:
+            self._client = client
+
     def _start_update(self, service_info: BluetoothServiceInfo) -> None:
         """Update from BLE advertisement data."""
         _LOGGER.debug("Parsing Sonicare BLE advertisement data: %s", service_info)
+        if self._recorder is not None:
+            self._recorder.record_advertisement(service_info)
         service_uuids = service_info.service_uuids
         address = service_info.address
         if (
@@ -145,16 +414,16 @@ class SonicareBluetoothDeviceData(BluetoothData):
             _LOGGER.debug("Not a Philips Sonicare BLE advertisement for address: %s", address)
             return
 
+        if self._brushing_state is BrushingState.BRUSHING and self._client is None:
+            self._set_brushing_state(BrushingState.RECENTLY_BRUSHED)
+        self._expire_recently_brushed()
 
-        self.set_device_manufacturer("Philips Sonicare")
-        # model = BYTES_TO_MODEL.get(device_bytes, Models.HX6340)
-        model = Models.HX992X
-        self._model = model
-        model_info = DEVICE_TYPES[model]
-        self.set_device_type(model_info.device_type)
-        name = f"{model_info.device_type} {short_address(address)}"
-        self.set_device_name(name)
-        self.set_title(name)
+        self._address = address
+        if self._model is None and service_info.name in LOCAL_NAME_TO_MODEL:
+            self._model = LOCAL_NAME_TO_MODEL[service_info.name]
+        if self._described != (address, self._model):
+            self.set_device_manufacturer("Philips Sonicare")
+            self._set_device_info(address)
 
     def poll_needed(
         self, service_info: BluetoothServiceInfo, last_poll: float | None
@@ -164,117 +433,184 @@ class SonicareBluetoothDeviceData(BluetoothData):
         device is working and online.
         """
         _LOGGER.debug("poll_needed called")
-        if last_poll is None:
-            return True
-        update_interval = NOT_BRUSHING_UPDATE_INTERVAL_SECONDS
-        if (
-            self._brushing
-            or time.monotonic() - self._last_brush <= TIMEOUT_RECENTLY_BRUSHING
-        ):
-            update_interval = BRUSHING_UPDATE_INTERVAL_SECONDS
+        if service_info is not None:
+            self._admission.update(service_info.source, service_info.rssi, self._clock())
+        self._expire_recently_brushed()
+        update_interval = self.brushing_policy.poll_interval
+        if update_interval is None:
+            _LOGGER.debug("poll_needed skipping poll while brushing")
+            return False
+        if last_poll is not None and last_poll <= update_interval:
+            return False
+        if service_info is not None and not self._admission.connection_likely(self._clock()):
+            now = self._clock()
+            if self._deferred_since is None:
+                self._deferred_since = now
+            if now - self._deferred_since <= MAX_DEFERRED_POLL_SECONDS:
+                _LOGGER.debug("poll_needed deferring poll until the signal improves")
+                return False
+        self._deferred_since = None
         _LOGGER.debug("poll_needed returning update_interval of %s", update_interval)
-        return last_poll > update_interval
+        return True
 
     async def async_poll(self, ble_device: BLEDevice) -> SensorUpdate:
         """
         Poll the device to retrieve any values we can't get from passive listening.
         """
         _LOGGER.debug("async_poll")
-        client = await establish_connection(
-            BleakClientWithServiceCache, ble_device, ble_device.address
-        )
+        if self._address is None:
+            self._address = ble_device.address
+        if self._recorder is None:
+            client = await establish_connection(
+                BleakClientWithServiceCache,
+                ble_device,
+                ble_device.address,
+                disconnected_callback=self._disconnected,
+            )
+            return await self._async_poll_client(client)
+
+        recorder = self._recorder
+        poll = self._trace_poll = recorder.record_poll(ble_device.address)
+        try:
+            client = await establish_connection(
+                BleakClientWithServiceCache,
+                ble_device,
+                ble_device.address,
+                disconnected_callback=self._disconnected,
+            )
+            update = await self._async_poll_client(client)
+        except Exception as err:
+            recorder.record_poll_end(poll, str(err) or type(err).__name__)
+            raise
+        finally:
+            self._trace_poll = None
+        recorder.record_poll_end(poll)
+        return update
+
+    async def _async_read_char(self, client: BleakClientWithServiceCache, uuid: str) -> bytearray:
+        """Read a characteristic, recording it when a trace is being captured."""
+        payload = await client.read_gatt_char(client.services.get_characteristic(uuid))
+        self._read_plan.count_read()
+        if self._recorder is not None:
+            self._recorder.record_read(self._trace_poll, uuid, payload)
+        return payload
+
+    async def _async_detect_model(self, client: BleakClientWithServiceCache) -> None:
+        """Read the model number once, falling back to the default model if that fails."""
+        self._model_number_read = True
+        if client.services.get_characteristic(CHAR_DICT["MODEL"][0]) is None:
+            _LOGGER.debug("No model number characteristic, using %s", DEFAULT_MODEL.name)
+            return
+        try:
+            model_payload = await self._async_read_char(client, CHAR_DICT["MODEL"][0])
+        except BleakError as err:
+            _LOGGER.debug("Failed to read model number, using %s: %s", DEFAULT_MODEL.name, err)
+            return
+        model_number = model_payload.decode("utf-8", errors="replace")
+        model = model_from_model_number(model_number)
+        if model is None:
+            # Leave the model undetected so the default is never persisted
+            _LOGGER.debug("Unknown model number %s, using %s", model_number, DEFAULT_MODEL.name)
+            return
+        self._set_model(model)
+
+    async def _async_read_planned(self, client: BleakClientWithServiceCache, key: str) -> bytearray | None:
+        """Read a CHAR_DICT characteristic if the read plan says it is due."""
+        now = self._clock()
+        state = self._brushing_state.name
+        if not self._read_plan.due(key, state, now):
+            return None
+        payload = await self._async_read_char(client, CHAR_DICT[key][0])
+        self._read_plan.observe(key, state, bytes(payload), now)
+        return payload
+
+    async def _async_poll_client(self, client: BleakClientWithServiceCache) -> SensorUpdate:
+        """Read the toothbrush characteristics over an established connection."""
         new_session = False
+        self._read_plan.start_poll()
+        self._polling = True
         try:
-            state_char = client.services.get_characteristic(CHAR_DICT.get("STATE")[0])
-            state_payload = await client.read_gatt_char(state_char)
+            if self._model is None and not self._model_number_read:
+                await self._async_detect_model(client)
+
+            state_payload = await self._async_read_char(client, CHAR_DICT["STATE"][0])
             tb_state = STATES.get(state_payload[0], f"unknown state {state_payload[0]}")
             _LOGGER.debug("brushing state is changing to %s the payload is %s", tb_state, state_payload[0])
 
-            battery_char = client.services.get_characteristic(CHARACTERISTIC_BATTERY)
-            battery_payload = await client.read_gatt_char(battery_char)
+            self._update_brushing_state(state_payload[0])
+            if self.brushing_policy.keep_connected:
+                await self._async_subscribe(client)
+            else:
+                _LOGGER.debug("not updating frequently")
 
-            current_time_char = client.services.get_characteristic(
-                CHARACTERISTIC_CURRENT_TIME
-            )
-            current_time_payload = await client.read_gatt_char(current_time_char)
+            battery_payload = await self._async_read_planned(client, "BATTERY")
+
+            # The toothbrush clock changes on every read, so it is not planned
+            current_time_payload = await self._async_read_char(client, CHAR_DICT["CURRENT_TIME"][0])
             current_time_epoch = int.from_bytes(current_time_payload, "little")
             current_time_stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(current_time_epoch))
 
-            if tb_state == "run" or int.from_bytes(state_payload[0], "little") == 2:
-                self._brushing = True
-                self._last_brush = time.monotonic()
-                _LOGGER.debug("Toothbrush is running, subscribing to events")
-                await client.start_notify(CHAR_DICT.get("STATE")[0], self._notification_handler)
-                await client.start_notify(CHAR_DICT.get("BRUSHING_TIME")[0], self._notification_handler)
-                await client.start_notify(CHAR_DICT.get("MODE")[0], self._notification_handler)
-                await client.start_notify(CHAR_DICT.get("STRENGTH")[0], self._notification_handler)
-
-            else:
-                self._brushing = False
-                await client.stop_notify(CHAR_DICT.get("STATE")[0], self._notification_handler)
-                await client.stop_notify(CHAR_DICT.get("BRUSHING_TIME")[0], self._notification_handler)
-                await client.stop_notify(CHAR_DICT.get("MODE")[0], self._notification_handler)
-                await client.stop_notify(CHAR_DICT.get("STRENGTH")[0], self._notification_handler)
-                _LOGGER.debug("not updating frequently")
-
-            session_payload = await client.read_gatt_char(
-                client.services.get_characteristic(CHAR_DICT.get("SESSION_ID")[0])
-            )
+            session_payload = await self._async_read_char(client, CHAR_DICT["SESSION_ID"][0])
             session = int.from_bytes(session_payload, "little")
 
             if self._session is None or self._session != session:
                 self._session = session
                 new_session = True
                 _LOGGER.debug(f"New brushing session: {session}")
-                brush_serial_number_char = client.services.get_characteristic(CHAR_DICT.get("BRUSH_SERIAL_NUMBER")[0])
-                serial_number_payload = await client.read_gatt_char(brush_serial_number_char)
-                serial_number = int.from_bytes(serial_number_payload, "little")
+                # Values the read plan skips keep the last value read
+                serial_number_payload = await self._async_read_planned(client, "BRUSH_SERIAL_NUMBER")
+                if serial_number_payload is not None:
+                    self._serial_number = int.from_bytes(serial_number_payload, "little")
 
-                brush_usage_char = client.services.get_characteristic(CHAR_DICT.get("BRUSH_USAGE")[0])
-                brush_usage_payload = await client.read_gatt_char(brush_usage_char)
-                usage = int.from_bytes(brush_usage_payload, "little")
+                brush_usage_payload = await self._async_read_planned(client, "BRUSH_USAGE")
+                if brush_usage_payload is not None:
+                    self._brush_head_usage = int.from_bytes(brush_usage_payload, "little")
 
-                brush_lifetime_char = client.services.get_characteristic(CHARACTERISTIC_BRUSH_LIFETIME)
-                brush_lifetime_payload = await client.read_gatt_char(brush_lifetime_char)
-                lifetime = int.from_bytes(brush_lifetime_payload, "little")
+                brush_lifetime_payload = await self._async_read_planned(client, "BRUSH_HEAD_LIFETIME")
+                if brush_lifetime_payload is not None:
+                    self._brush_head_lifetime = int.from_bytes(brush_lifetime_payload, "little")
 
-                if lifetime != 0 and usage != 0:
-                    brush_life_percentage_left = round(((lifetime - usage) / lifetime) * 100)
-                else:
-                    brush_life_percentage_left = 0
+                if self._supports("MODE"):
+                    mode_payload = await self._async_read_planned(client, "MODE")
+                    if mode_payload is not None:
+                        self._mode_int = int.from_bytes(mode_payload, "little")
 
-                mode_char = client.services.get_characteristic(CHARACTERISTIC_MODE)
-                mode_payload = await client.read_gatt_char(mode_char)
-                mode_int = int.from_bytes(mode_payload, "little")
-                if self._model:
-                    info = DEVICE_TYPES[self._model]
-                    mode = info.modes.get(mode_int, f"unknown mode {mode_int}")
-                else:
-                    mode = "unknown mode"
+                if self._supports("STRENGTH"):
+                    strength_payload = await self._async_read_planned(client, "STRENGTH")
+                    if strength_payload is not None:
+                        self._strength_int = int.from_bytes(strength_payload, "little")
 
-                strength_char = client.services.get_characteristic(CHARACTERISTIC_STRENGTH)
-                strength_payload = await client.read_gatt_char(strength_char)
-                strength_result = STRENGTH.get(int.from_bytes(strength_payload, "little"),
-                                               f"unknown speed {strength_payload}")
-
-
-
-                brushing_time_char = client.services.get_characteristic(
-                    CHARACTERISTIC_BRUSHING_TIME
-                )
-                brushing_time_payload = await client.read_gatt_char(brushing_time_char)
+                brushing_time_payload = await self._async_read_planned(client, "BRUSHING_TIME")
+                if brushing_time_payload is not None:
+                    self._brushing_time = int.from_bytes(brushing_time_payload, "little")
 
         finally:
-            if not self._brushing:
+            self._polling = False
+            if self._client is not client:
                 await client.disconnect()
 
-        self.update_sensor(
-            str(SonicareSensor.BATTERY_PERCENT),
-            Units.PERCENTAGE,
-            battery_payload[0],
-            SensorDeviceClass.BATTERY,
-            "Battery",
-        )
+        status = {"toothbrush_state": state_payload[0]}
+        if battery_payload is not None:
+            status["battery"] = battery_payload[0]
+        usage = self._brush_head_usage
+        lifetime = self._brush_head_lifetime
+        brush_life_percentage_left = None
+        if usage is not None and lifetime is not None:
+            brush_life_percentage_left = round(brush_head_percentage_left(usage, lifetime))
+        if new_session:
+            status["session_id"] = session
+            status["brush_head_percentage"] = brush_life_percentage_left
+            status["brushing_time"] = self._brushing_time
+        self._export_status(**status)
+
+        if battery_payload is not None:
+            self.update_sensor(
+                str(SonicareSensor.BATTERY_PERCENT),
+                Units.PERCENTAGE,
+                battery_payload[0],
+                SensorDeviceClass.BATTERY,
+                "Battery",
+            )
 
         self.update_sensor(
             str(SonicareSensor.TOOTHBRUSH_STATE),
@@ -312,18 +648,19 @@ class SonicareBluetoothDeviceData(BluetoothData):
             self.update_sensor(
                 str(SonicareSensor.BRUSH_SERIAL_NUMBER),
                 None,
-                serial_number,
+                self._serial_number,
                 None,
                 "Toothbrush serial number"
             )
 
-            self.update_sensor(
-                str(SonicareSensor.BRUSH_LIFETIME_PERCENTAGE),
-                None,
-                brush_life_percentage_left,
-                None,
-                "Brush head remaining"
-            )
+            if brush_life_percentage_left is not None:
+                self.update_sensor(
+                    str(SonicareSensor.BRUSH_LIFETIME_PERCENTAGE),
+                    None,
+                    brush_life_percentage_left,
+                    None,
+                    "Brush head remaining"
+                )
 
             self.update_sensor(
                 str(SonicareSensor.BRUSH_SESSION_ID),
@@ -332,44 +669,42 @@ class SonicareBluetoothDeviceData(BluetoothData):
                 None,
                 "Session ID"
             )
-            self.update_sensor(
-                str(SonicareSensor.BRUSHING_TIME),
-                None,
-                int.from_bytes(brushing_time_payload, "little"),
-                None,
-                "Brushing time",
-            )
-            self.update_sensor(
-                str(SonicareSensor.MODE),
-                None,
-                mode,
-                None,
-                "Toothbrush current mode"
-            )
+            if self._brushing_time is not None:
+                self.update_sensor(
+                    str(SonicareSensor.BRUSHING_TIME),
+                    None,
+                    self._brushing_time,
+                    None,
+                    "Brushing time",
+                )
+            if self._supports("MODE") and self._mode_int is not None:
+                self.update_sensor(
+                    str(SonicareSensor.MODE),
+                    None,
+                    self.model_info.modes.get(self._mode_int, f"unknown mode {self._mode_int}"),
+                    None,
+                    "Toothbrush current mode"
+                )
 
-            self.update_sensor(
-                str(SonicareSensor.BRUSH_STRENGTH),
-                None,
-                strength_result,
-                None,
-                "Toothbrush current strength"
-            )
+            if self._supports("STRENGTH") and self._strength_int is not None:
+                self.update_sensor(
+                    str(SonicareSensor.BRUSH_STRENGTH),
+                    None,
+                    STRENGTH.get(self._strength_int, f"unknown speed {self._strength_int}"),
+                    None,
+                    "Toothbrush current strength"
+                )
         return self._finish_update()
 
     def _notification_handler(self, _sender: BleakGATTCharacteristic, data: bytearray) -> SensorUpdate:
         """Start notification"""
-        _LOGGER.error(f"notification handler executed for {_sender.uuid} with value of {data}")
+        if self._recorder is not None:
+            self._recorder.record_notification(_sender.uuid, data)
+        _LOGGER.debug(f"notification handler executed for {_sender.uuid} with value of {data}")
         if _sender.uuid == CHAR_DICT.get("STATE")[0]:
             sensor_value = STATES.get(data[0], f"unknown state {data[0]}")
-            sensor_id = CHAR_DICT.get("STATE")[1]
-            sensor_string = CHAR_DICT.get("STATE")[2]
-            if sensor_value != 2:
-                self._brushing = False
-                _LOGGER.error("brushing ended")
-            else:
-                self._last_brush = time.monotonic()
-                self._brushing = True
-                _LOGGER.error("brushing started")
+            self._update_brushing_state(data[0])
+            self._export_status(toothbrush_state=data[0])
             self.update_sensor(
                 str(SonicareSensor.TOOTHBRUSH_STATE),
                 None,
@@ -380,16 +715,17 @@ class SonicareBluetoothDeviceData(BluetoothData):
             return self._finish_update()
         elif _sender.uuid == CHAR_DICT.get("BRUSHING_TIME")[0]:
             value = int.from_bytes(data, "little")
-            sensor_value = value
+            sensor_value = self._brushing_time = value
+            self._export_status(brushing_time=value)
             sensor_id = CHAR_DICT.get("BRUSHING_TIME")[1]
             sensor_string = CHAR_DICT.get("BRUSHING_TIME")[2]
         elif _sender.uuid == CHAR_DICT.get("MODE")[0]:
-            value = int.from_bytes(data, "little")
-            sensor_value = DEVICE_TYPES[self._model].modes.get(value, f"unknown mode")
+            value = self._mode_int = int.from_bytes(data, "little")
+            sensor_value = self.model_info.modes.get(value, f"unknown mode")
             sensor_id = CHAR_DICT.get("MODE")[1]
             sensor_string = CHAR_DICT.get("MODE")[2]
         elif _sender.uuid == CHAR_DICT.get("STRENGTH")[0]:
-            value = int.from_bytes(data, "little")
+            value = self._strength_int = int.from_bytes(data, "little")
             sensor_value = STRENGTH.get(value, f"unknown speed")
             sensor_id = CHAR_DICT.get("STRENGTH")[1]
             sensor_string = CHAR_DICT.get("STRENGTH")[2]
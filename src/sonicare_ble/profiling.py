@@ -0,0 +1,228 @@
+"""Memory profile of simulated Sonicare toothbrushes.
+
+Runs a fleet of simulated devices through advertisements, polls and brushing
+notifications under tracemalloc and reports peak and steady state memory per
+device along with the top allocation sites of each hot path::
+
+    python -m sonicare_ble.profiling --devices 500 --max-bytes-per-device 20000
+
+The report is printed as JSON and the exit code is 1 when the steady state
+memory per device is above ``--max-bytes-per-device``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tracemalloc
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from home_assistant_bluetooth import BluetoothServiceInfo
+
+from .const import CHAR_DICT, SONICARE_ADVERTISMENT_UUID
+from .fleet import SonicareFleet
+from .trace import ReplayCharacteristic, ReplayClient
+
+PHASES = ("advertisement", "poll", "notification")
+
+
+@dataclass
+class AllocationSite:
+    filename: str
+    lineno: int
+    size: int
+    count: int
+
+
+@dataclass
+class MemoryProfile:
+    devices: int
+    rounds: int
+    peak_bytes: int
+    steady_bytes: int
+    peak_bytes_per_device: float
+    steady_bytes_per_device: float
+    top_sites: dict[str, list[AllocationSite]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _address(index: int) -> str:
+    return "24:E5:AA:" + ":".join(f"{(index >> shift) & 0xFF:02X}" for shift in (16, 8, 0))
+
+
+def _service_info(address: str, rssi: int) -> BluetoothServiceInfo:
+    return BluetoothServiceInfo(
+        name=address,
+        address=address,
+        rssi=rssi,
+        manufacturer_data={477: b"\x00\x1b\x00" + bytes.fromhex(address.replace(":", ""))},
+        service_uuids=[SONICARE_ADVERTISMENT_UUID],
+        service_data={},
+        source="local",
+    )
+
+
+def _poll_client(session: int) -> ReplayClient:
+    payloads = {
+        "MODEL": b"HX9924",
+        "STATE": b"\x01",
+        "BATTERY": bytes([90 - session % 50]),
+        "CURRENT_TIME": (1674980000 + session * 60).to_bytes(4, "little"),
+        "SESSION_ID": session.to_bytes(2, "little"),
+        "BRUSH_SERIAL_NUMBER": b"\x01\x02\x03\x04",
+        "BRUSH_USAGE": (session * 120).to_bytes(4, "little"),
+        "BRUSH_HEAD_LIFETIME": (180 * 120).to_bytes(4, "little"),
+        "MODE": b"\x78",
+        "STRENGTH": b"\x01",
+        "BRUSHING_TIME": b"\x78\x00",
+    }
+    return ReplayClient(
+        {CHAR_DICT[key][0]: deque([bytearray(value)]) for key, value in payloads.items()}
+    )
+
+
+def _top_sites(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int
+) -> list[AllocationSite]:
+    sites = []
+    for stat in after.compare_to(before, "lineno"):
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        sites.append(AllocationSite(frame.filename, frame.lineno, stat.size_diff, stat.count_diff))
+        if len(sites) == top:
+            break
+    return sites
+
+
+def _filtered(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+    return snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+    )
+
+
+class _Simulation:
+    """A fleet of simulated toothbrushes driven one round at a time."""
+
+    def __init__(self, devices: int) -> None:
+        self.fleet = SonicareFleet()
+        self.addresses = [_address(index) for index in range(devices)]
+        self.state_char = ReplayCharacteristic(CHAR_DICT["STATE"][0])
+        self.brushing_time_char = ReplayCharacteristic(CHAR_DICT["BRUSHING_TIME"][0])
+        self.rounds = 0
+
+    def advertisements(self) -> list[Any]:
+        rssi = -60 - self.rounds % 20
+        updates = self.fleet.update_batch(
+            _service_info(address, rssi) for address in self.addresses
+        )
+        return list(updates.values())
+
+    async def polls(self) -> list[Any]:
+        return [
+            await self.fleet.parser(address)._async_poll_client(_poll_client(self.rounds + 1))
+            for address in self.addresses
+        ]
+
+    def notifications(self) -> list[Any]:
+        updates = []
+        for address in self.addresses:
+            parser = self.fleet.parser(address)
+            updates.append(parser._notification_handler(self.state_char, bytearray(b"\x02")))
+            for seconds in range(0, 120, 30):
+                updates.append(
+                    parser._notification_handler(
+                        self.brushing_time_char, bytearray(seconds.to_bytes(2, "little"))
+                    )
+                )
+            updates.append(parser._notification_handler(self.state_char, bytearray(b"\x01")))
+        return updates
+
+    async def run_round(self) -> None:
+        self.advertisements()
+        await self.polls()
+        self.notifications()
+        self.rounds += 1
+
+
+async def _async_profile(devices: int, rounds: int, top: int) -> MemoryProfile:
+    # Leave tracing on if the caller was already tracing
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        simulation = _Simulation(devices)
+        for _ in range(rounds):
+            await simulation.run_round()
+        current, peak = tracemalloc.get_traced_memory()
+
+        # Keep the updates from one more round alive so the objects built on each
+        # hot path show up in the snapshot differences
+        sites: dict[str, list[AllocationSite]] = {}
+        kept: list[Any] = []
+        snapshot = _filtered(tracemalloc.take_snapshot())
+        for phase in PHASES:
+            if phase == "advertisement":
+                kept.append(simulation.advertisements())
+            elif phase == "poll":
+                kept.append(await simulation.polls())
+            else:
+                kept.append(simulation.notifications())
+            after = _filtered(tracemalloc.take_snapshot())
+            sites[phase] = _top_sites(snapshot, after, top)
+            snapshot = after
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    peak_bytes = peak - baseline
+    steady_bytes = current - baseline
+    return MemoryProfile(
+        devices=devices,
+        rounds=rounds,
+        peak_bytes=peak_bytes,
+        steady_bytes=steady_bytes,
+        peak_bytes_per_device=peak_bytes / devices,
+        steady_bytes_per_device=steady_bytes / devices,
+        top_sites=sites,
+    )
+
+
+def profile_memory(devices: int = 100, rounds: int = 3, top: int = 10) -> MemoryProfile:
+    """Run the simulated fleet under tracemalloc and return the memory profile."""
+    if devices < 1 or rounds < 1:
+        raise ValueError("devices and rounds must be at least 1")
+    return asyncio.run(_async_profile(devices, rounds, top))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-bytes-per-device", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    profile = profile_memory(args.devices, args.rounds, args.top)
+    json.dump(profile.to_dict(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    if (
+        args.max_bytes_per_device is not None
+        and profile.steady_bytes_per_device > args.max_bytes_per_device
+    ):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
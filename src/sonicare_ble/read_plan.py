@@ -0,0 +1,99 @@
+"""Learn how often characteristics change and read them only when due."""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from .const import PREFETCH_SECONDS, READ_INTERVAL_MAX_SECONDS, READ_INTERVAL_MIN_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class CharacteristicStats:
+    reads: int = 0
+    changes: int = 0
+    last_value: bytes | None = None
+    last_read: float | None = None
+    interval: float = READ_INTERVAL_MIN_SECONDS
+
+    @property
+    def change_rate(self) -> float:
+        """Return the fraction of reads that returned a new value."""
+        return self.changes / self.reads if self.reads else 0.0
+
+
+class ReadPlan:
+    """
+    Track, per characteristic and brushing state, how often a value changes.
+
+    The read interval doubles every time a read returns the same value and drops
+    back to the minimum when it changes. Reads that fall due within the prefetch
+    window are taken early since the connection is already open for the poll.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = READ_INTERVAL_MIN_SECONDS,
+        max_interval: float = READ_INTERVAL_MAX_SECONDS,
+        prefetch: float = PREFETCH_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._prefetch = prefetch
+        self._stats: dict[tuple[str, str], CharacteristicStats] = {}
+        self.polls = 0
+        self.reads = 0
+
+    def _get(self, key: str, state: str) -> CharacteristicStats:
+        stats = self._stats.get((key, state))
+        if stats is None:
+            stats = self._stats[(key, state)] = CharacteristicStats(interval=self._min_interval)
+        return stats
+
+    def set_clock(self, clock: Callable[[], float]) -> None:
+        """Use another monotonic clock, for example the recorded time of a trace."""
+        self._clock = clock
+
+    def start_poll(self) -> None:
+        self.polls += 1
+
+    def count_read(self) -> None:
+        self.reads += 1
+
+    @property
+    def reads_per_poll(self) -> float:
+        return self.reads / self.polls if self.polls else 0.0
+
+    def due(self, key: str, state: str, now: float | None = None) -> bool:
+        """Return if the characteristic is due, or due within the prefetch window."""
+        if now is None:
+            now = self._clock()
+        stats = self._get(key, state)
+        if stats.last_read is None:
+            return True
+        return now + self._prefetch >= stats.last_read + stats.interval
+
+    def observe(self, key: str, state: str, value: bytes, now: float | None = None) -> None:
+        """Record a read and adapt the interval to whether the value changed."""
+        if now is None:
+            now = self._clock()
+        stats = self._get(key, state)
+        stats.reads += 1
+        if stats.last_value is not None and value == stats.last_value:
+            stats.interval = min(stats.interval * 2, self._max_interval)
+        else:
+            if stats.last_value is not None:
+                stats.changes += 1
+            stats.interval = self._min_interval
+        stats.last_value = value
+        stats.last_read = now
+        _LOGGER.debug("Next read of %s while %s in %ss", key, state, stats.interval)
+
+    def stats(self) -> dict[tuple[str, str], CharacteristicStats]:
+        """Return the statistics keyed by characteristic and brushing state."""
+        return dict(self._stats)
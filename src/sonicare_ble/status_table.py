@@ -0,0 +1,180 @@
+"""Memory-mapped table of the latest decoded values for each toothbrush.
+
+One process writes the table while any number of processes map the same file
+read-only. The file starts with a header followed by fixed size rows, one per
+device. Every row carries a sequence counter that is odd while the row is being
+written, so readers retry until they see the same even counter before and after
+unpacking the row.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import struct
+import time
+from dataclasses import dataclass
+from typing import Any
+
+MAGIC = b"SCST"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHI4x")
+# seq, address, toothbrush state, brushing state, battery, brush head %,
+# brushing time, session id, updated (epoch seconds)
+ROW = struct.Struct("<I6sBBBBHId4x")
+
+UNKNOWN_U8 = 0xFF
+UNKNOWN_U16 = 0xFFFF
+UNKNOWN_U32 = 0xFFFFFFFF
+
+# Row fields that can be updated, with their index in ROW and unknown value
+FIELDS = {
+    "toothbrush_state": (2, UNKNOWN_U8),
+    "brushing_state": (3, UNKNOWN_U8),
+    "battery": (4, UNKNOWN_U8),
+    "brush_head_percentage": (5, UNKNOWN_U8),
+    "brushing_time": (6, UNKNOWN_U16),
+    "session_id": (7, UNKNOWN_U32),
+}
+
+READ_RETRIES = 100
+
+MAC_ADDRESS = re.compile(r"[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}")
+
+
+class StatusTableError(Exception):
+    """
+    Raised when a status table is full, an address is not a MAC address or a
+    table does not match the expected layout.
+    """
+
+
+def _pack_address(address: str) -> bytes:
+    # Rows hold a 6 byte MAC, other addresses (CoreBluetooth UUIDs) do not fit
+    if not MAC_ADDRESS.fullmatch(address):
+        raise StatusTableError(f"{address} is not a MAC address")
+    return bytes.fromhex(address.replace(":", ""))
+
+
+def _unpack_address(packed: bytes) -> str:
+    return ":".join(f"{byte:02X}" for byte in packed)
+
+
+@dataclass(frozen=True)
+class DeviceStatus:
+    """A consistent snapshot of one row; unknown values are None."""
+
+    address: str
+    seq: int
+    toothbrush_state: int | None
+    brushing_state: int | None
+    battery: int | None
+    brush_head_percentage: int | None
+    brushing_time: int | None
+    session_id: int | None
+    updated: float
+
+
+def _row_offset(index: int) -> int:
+    return HEADER.size + index * ROW.size
+
+
+class StatusTableWriter:
+    """Create a status table and write device updates into it."""
+
+    def __init__(self, path: str, rows: int) -> None:
+        size = _row_offset(rows)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._rows = rows
+        self._mmap[:size] = bytes(size)
+        HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, 0, rows)
+        self._index: dict[str, int] = {}
+
+    def _row_index(self, address: str) -> int:
+        index = self._index.get(address)
+        if index is not None:
+            return index
+        packed = _pack_address(address)
+        index = len(self._index)
+        if index >= self._rows:
+            raise StatusTableError(f"Status table is full ({self._rows} rows)")
+        unknown = [0, packed] + [value for _, value in FIELDS.values()] + [0.0]
+        ROW.pack_into(self._mmap, _row_offset(index), *unknown)
+        self._index[address] = index
+        return index
+
+    def update(self, address: str, **values: Any) -> None:
+        """Update some fields of a device row, leaving the others untouched."""
+        offset = _row_offset(self._row_index(address))
+        row = list(ROW.unpack_from(self._mmap, offset))
+        for name, value in values.items():
+            position, unknown = FIELDS[name]
+            row[position] = unknown if value is None else value
+        row[-1] = time.time()
+        seq = row[0]
+        # Mark the row as being written before touching the values
+        struct.pack_into("<I", self._mmap, offset, (seq + 1) & UNKNOWN_U32)
+        row[0] = (seq + 1) & UNKNOWN_U32
+        ROW.pack_into(self._mmap, offset, *row)
+        struct.pack_into("<I", self._mmap, offset, (seq + 2) & UNKNOWN_U32)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+class StatusTableReader:
+    """Map a status table written by another process and read row snapshots."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, rows = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise StatusTableError(f"{path} is not a version {VERSION} status table")
+        self._rows = rows
+
+    def _snapshot(self, index: int) -> DeviceStatus | None:
+        offset = _row_offset(index)
+        for _ in range(READ_RETRIES):
+            row = ROW.unpack_from(self._mmap, offset)
+            seq = row[0]
+            if seq & 1:
+                continue
+            if struct.unpack_from("<I", self._mmap, offset)[0] != seq:
+                continue
+            if seq == 0:
+                return None
+            values = {
+                name: None if row[position] == unknown else row[position]
+                for name, (position, unknown) in FIELDS.items()
+            }
+            return DeviceStatus(
+                address=_unpack_address(row[1]), seq=seq, updated=row[-1], **values
+            )
+        raise StatusTableError(f"Row {index} kept changing while being read")
+
+    def snapshots(self) -> list[DeviceStatus]:
+        """Return a snapshot of every row that has been written."""
+        statuses = []
+        for index in range(self._rows):
+            status = self._snapshot(index)
+            if status is None:
+                break
+            statuses.append(status)
+        return statuses
+
+    def snapshot(self, address: str) -> DeviceStatus | None:
+        """Return a snapshot of the row for an address."""
+        for status in self.snapshots():
+            if status.address == address.upper():
+                return status
+        return None
+
+    def close(self) -> None:
+        self._mmap.close()
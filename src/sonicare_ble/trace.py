@@ -0,0 +1,243 @@
+"""Record and replay Sonicare BLE sessions.
+
+A trace is a line-delimited JSON file. Each line is one record with a ``t``
+timestamp in seconds since the start of the recording and a ``type`` of
+``adv``, ``poll``, ``read``, ``poll_end`` or ``notify``. Reads and the
+``poll_end`` record carry the id of the poll they belong to, and ``poll_end``
+holds the error when the poll failed. Payloads are stored as hex strings.
+Paths ending in ``.gz`` are compressed transparently.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable
+
+from home_assistant_bluetooth import BluetoothServiceInfo
+from sensor_state_data import SensorUpdate
+
+from .parser import SonicareBluetoothDeviceData
+
+RECORD_ADVERTISEMENT = "adv"
+RECORD_POLL = "poll"
+RECORD_READ = "read"
+RECORD_POLL_END = "poll_end"
+RECORD_NOTIFY = "notify"
+
+
+def open_trace(path: str, mode: str = "r") -> IO[str]:
+    """Open a trace file for reading or writing text."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def service_info_to_record(service_info: BluetoothServiceInfo) -> dict[str, Any]:
+    """Convert a BluetoothServiceInfo to a JSON friendly record."""
+    return {
+        "name": service_info.name,
+        "address": service_info.address,
+        "rssi": service_info.rssi,
+        "manufacturer_data": {
+            str(manufacturer_id): data.hex()
+            for manufacturer_id, data in service_info.manufacturer_data.items()
+        },
+        "service_data": {
+            uuid: data.hex() for uuid, data in service_info.service_data.items()
+        },
+        "service_uuids": list(service_info.service_uuids),
+        "source": service_info.source,
+    }
+
+
+def record_to_service_info(record: dict[str, Any]) -> BluetoothServiceInfo:
+    """Convert a trace record back to a BluetoothServiceInfo."""
+    return BluetoothServiceInfo(
+        name=record["name"],
+        address=record["address"],
+        rssi=record["rssi"],
+        manufacturer_data={
+            int(manufacturer_id): bytes.fromhex(data)
+            for manufacturer_id, data in record["manufacturer_data"].items()
+        },
+        service_data={
+            uuid: bytes.fromhex(data) for uuid, data in record["service_data"].items()
+        },
+        service_uuids=record["service_uuids"],
+        source=record["source"],
+    )
+
+
+class TraceRecorder:
+    """Write advertisements, polls, GATT reads and notifications to a trace."""
+
+    def __init__(self, fp: IO[str], clock: Callable[[], float] = time.monotonic) -> None:
+        self._fp = fp
+        self._clock = clock
+        self._start = clock()
+        self._polls = 0
+
+    def _write(self, record_type: str, record: dict[str, Any]) -> None:
+        record = {"t": round(self._clock() - self._start, 3), "type": record_type, **record}
+        self._fp.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def record_advertisement(self, service_info: BluetoothServiceInfo) -> None:
+        self._write(RECORD_ADVERTISEMENT, service_info_to_record(service_info))
+
+    def record_poll(self, address: str) -> int:
+        """Record the start of a poll and return the id to tag its reads with."""
+        self._polls += 1
+        self._write(RECORD_POLL, {"poll": self._polls, "address": address})
+        return self._polls
+
+    def record_read(self, poll: int | None, uuid: str, data: bytes | bytearray) -> None:
+        self._write(RECORD_READ, {"poll": poll, "uuid": uuid, "data": data.hex()})
+
+    def record_poll_end(self, poll: int, error: str | None = None) -> None:
+        self._write(RECORD_POLL_END, {"poll": poll, "error": error})
+
+    def record_notification(self, uuid: str, data: bytes | bytearray) -> None:
+        self._write(RECORD_NOTIFY, {"uuid": uuid, "data": data.hex()})
+
+
+def iter_trace(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Iterate the records of a trace, skipping blank lines."""
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+class TraceReplayError(Exception):
+    """Raised when a poll asks for a read that is not in the trace."""
+
+
+@dataclass
+class ReplayCharacteristic:
+    """Stand-in for a BleakGATTCharacteristic during replay."""
+
+    uuid: str
+
+
+@dataclass
+class ReplayServices:
+    def get_characteristic(self, uuid: str) -> ReplayCharacteristic:
+        return ReplayCharacteristic(uuid)
+
+
+class ReplayClock:
+    """Monotonic clock that follows the recorded timestamps during replay."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class ReplayClient:
+    """Stand-in for a connected client that serves recorded GATT reads."""
+
+    reads: dict[str, deque[bytearray]]
+    services: ReplayServices = field(default_factory=ReplayServices)
+    # Recorded time of every read, to move the clock to as it is served
+    read_times: dict[str, deque[float]] = field(default_factory=dict)
+    clock: ReplayClock | None = None
+
+    async def read_gatt_char(self, char: ReplayCharacteristic) -> bytearray:
+        reads = self.reads.get(char.uuid)
+        if not reads:
+            raise TraceReplayError(f"No recorded read of {char.uuid} left for this poll")
+        read_times = self.read_times.get(char.uuid)
+        if self.clock is not None and read_times:
+            self.clock.now = read_times.popleft()
+        return reads.popleft()
+
+    async def start_notify(self, uuid: str, callback: Callable[..., Any]) -> None:
+        """Notifications are replayed from their own records."""
+
+    async def disconnect(self) -> None:
+        """Nothing to disconnect during replay."""
+
+
+class TraceReplayer:
+    """Feed a recorded trace back through SonicareBluetoothDeviceData."""
+
+    def __init__(self, records: Iterable[dict[str, Any]]) -> None:
+        self._records: list[dict[str, Any]] = []
+        self._poll_reads: dict[int, list[dict[str, Any]]] = {}
+        self._poll_errors: dict[int, str | None] = {}
+        for record in records:
+            record_type = record["type"]
+            if record_type == RECORD_READ:
+                self._poll_reads.setdefault(record["poll"], []).append(record)
+            elif record_type == RECORD_POLL_END:
+                self._poll_errors[record["poll"]] = record["error"]
+            else:
+                self._records.append(record)
+
+    def _poll_client(self, poll: int, clock: ReplayClock) -> ReplayClient:
+        reads: dict[str, deque[bytearray]] = {}
+        read_times: dict[str, deque[float]] = {}
+        for read in self._poll_reads.get(poll, ()):
+            reads.setdefault(read["uuid"], deque()).append(bytearray.fromhex(read["data"]))
+            read_times.setdefault(read["uuid"], deque()).append(read["t"])
+        return ReplayClient(reads, read_times=read_times, clock=clock)
+
+    @classmethod
+    def from_file(cls, path: str) -> TraceReplayer:
+        with open_trace(path) as fp:
+            return cls(iter_trace(fp))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def replay(
+        self,
+        parser: SonicareBluetoothDeviceData,
+        speed: float | None = None,
+    ) -> list[SensorUpdate]:
+        """
+        Replay the trace into the parser and return the updates it produced.
+
+        With a speed of None records are replayed as fast as possible, otherwise
+        the recorded gaps are honoured, scaled down by speed. Either way the
+        parser's clock follows the recorded timestamps, so timeouts and the read
+        plan make the same decisions as during recording. Polls recorded as
+        failed are replayed up to the point they failed and produce no update.
+        """
+        updates: list[SensorUpdate] = []
+        clock = ReplayClock()
+        parser.set_clock(clock)
+        last_t: float | None = None
+        for record in self._records:
+            if speed is not None and last_t is not None and record["t"] > last_t:
+                await asyncio.sleep((record["t"] - last_t) / speed)
+            last_t = clock.now = record["t"]
+            record_type = record["type"]
+            if record_type == RECORD_ADVERTISEMENT:
+                updates.append(parser.update(record_to_service_info(record)))
+            elif record_type == RECORD_POLL:
+                poll = record["poll"]
+                failed = self._poll_errors.get(poll) is not None
+                if failed and poll not in self._poll_reads:
+                    # The connection was never established
+                    continue
+                try:
+                    updates.append(await parser._async_poll_client(self._poll_client(poll, clock)))
+                except TraceReplayError:
+                    if not failed:
+                        raise
+            elif record_type == RECORD_NOTIFY:
+                updates.append(
+                    parser._notification_handler(
+                        ReplayCharacteristic(record["uuid"]),
+                        bytearray.fromhex(record["data"]),
+                    )
+                )
+        return updates
@@ -0,0 +1,59 @@
+from unittest import mock
+
+from bluetooth_sensor_state_data import BluetoothServiceInfo
+
+from sonicare_ble.admission import ConnectionAdmission
+from sonicare_ble.parser import SonicareBluetoothDeviceData
+
+
+def _service_info(rssi, source="local"):
+    return BluetoothServiceInfo(
+        name="24:E5:AA:1A:70:A6",
+        address="24:E5:AA:1A:70:A6",
+        rssi=rssi,
+        manufacturer_data={},
+        service_uuids=["477ea600-a260-11e4-ae37-0002a5d50001"],
+        service_data={},
+        source=source,
+    )
+
+
+def test_rssi_is_smoothed():
+    admission = ConnectionAdmission(smoothing=0.5)
+    admission.update("local", -60, now=0)
+    admission.update("local", -80, now=1)
+    assert admission.rssi("local") == -70
+
+
+def test_best_source_ignores_stale_sources():
+    admission = ConnectionAdmission(stale_seconds=10)
+    admission.update("proxy", -50, now=0)
+    admission.update("local", -70, now=5)
+    assert admission.best_source(now=6) == "proxy"
+    assert admission.best_source(now=12) == "local"
+    assert admission.best_source(now=20) is None
+
+
+def test_connection_likely():
+    admission = ConnectionAdmission(min_rssi=-85)
+    assert not admission.connection_likely(now=0)
+    admission.update("local", -90, now=0)
+    assert not admission.connection_likely(now=0)
+    admission.update("proxy", -70, now=0)
+    assert admission.connection_likely(now=0)
+
+
+@mock.patch("sonicare_ble.parser.time")
+def test_poll_needed_defers_weak_signal(mocked_time):
+    parser = SonicareBluetoothDeviceData()
+    mocked_time.monotonic.return_value = 0
+    assert not parser.poll_needed(_service_info(-95), None)
+    mocked_time.monotonic.return_value = 301
+    assert parser.poll_needed(_service_info(-95), None)
+
+
+def test_poll_needed_prefers_strongest_source():
+    parser = SonicareBluetoothDeviceData()
+    parser.poll_needed(_service_info(-95, "local"), None)
+    assert parser.poll_needed(_service_info(-60, "proxy"), None)
+    assert parser.preferred_source == "proxy"
@@ -0,0 +1,110 @@
+from unittest import mock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sonicare_ble.analytics import SECONDS_PER_DAY, SessionStore  # noqa: E402
+from sonicare_ble.parser import (  # noqa: E402
+    Models,
+    SonicareBluetoothDeviceData,
+    brush_head_percentage_left,
+)
+
+DAY = SECONDS_PER_DAY
+
+
+def _store():
+    store = SessionStore(capacity=1)
+    store.append("AA", 1, 0 * DAY, 120, 120, 1, 100, 1000)
+    store.append("BB", 7, 1 * DAY, 90, 160, 2, 990, 1000)
+    store.append("AA", 2, 10 * DAY, 150, 200, None, 200, 1000)
+    store.append("BB", 8, 2 * DAY, 60, 160, 2, 990, 1000)
+    return store
+
+
+def test_columns_grow():
+    store = _store()
+    assert len(store) == 4
+    columns = store.columns()
+    assert columns["session_id"].tolist() == [1, 7, 2, 8]
+    assert columns["strength"].tolist() == [1, 2, -1, 2]
+
+
+def test_average_duration_and_modes():
+    store = _store()
+    assert store.average_duration() == 105
+    assert store.mode_distribution() == {120: 1, 160: 2, 200: 1}
+
+
+def test_brush_head_wear():
+    wear = _store().brush_head_wear()
+    assert wear.devices == ["AA", "BB"]
+    np.testing.assert_allclose(wear.percentage_left, [80, 1])
+    np.testing.assert_allclose(wear.wear_per_day, [10, 0])
+    assert wear.projected_replacement[0] == 90 * DAY
+    assert np.isnan(wear.projected_replacement[1])
+
+
+def test_empty_store():
+    store = SessionStore()
+    assert store.average_duration() == 0
+    assert store.mode_distribution() == {}
+    assert store.brush_head_wear().devices == []
+
+
+def test_new_brush_head_is_not_worn():
+    store = SessionStore()
+    store.append("AA", 1, 0, 120, 120, 1, 0, 1000)
+    store.append("BB", 1, 0, 120, 120, 1, 1200, 1000)
+    store.append("CC", 1, 0, 120, 120, 1, 100, 0)
+    wear = store.brush_head_wear()
+    np.testing.assert_allclose(wear.percentage_left, [100, 0, 0])
+    assert brush_head_percentage_left(0, 1000) == 100
+
+
+def test_brush_head_wear_after_replacement():
+    store = SessionStore()
+    store.append("AA", 1, 0 * DAY, 120, 120, 1, 900, 1000)
+    store.append("AA", 2, 2 * DAY, 120, 120, 1, 0, 1000)
+    for day in range(3, 31):
+        store.append("AA", day, day * DAY, 120, 120, 1, (day - 2) * 10, 1000)
+    wear = store.brush_head_wear()
+    np.testing.assert_allclose(wear.wear_per_day, [10])
+    np.testing.assert_allclose(wear.percentage_left, [72])
+    assert wear.projected_replacement[0] == 102 * DAY
+
+
+@pytest.mark.asyncio
+async def test_parser_stores_session_when_brushing_stops():
+    def poll_client(state):
+        client = mock.AsyncMock()
+        client.services.get_characteristic = lambda uuid: mock.Mock(uuid=uuid)
+        client.read_gatt_char.side_effect = lambda char: (
+            bytearray(state) if char.uuid.endswith("4010") else bytearray(b"\x07\x00")
+        )
+        return client
+
+    store = SessionStore()
+    parser = SonicareBluetoothDeviceData(model=Models.HX992X)
+    parser._address = "AA"
+    parser.set_session_store(store)
+    state_char = mock.Mock(uuid="477ea600-a260-11e4-ae37-0002a5d54010")
+    brushing_time_char = mock.Mock(uuid="477ea600-a260-11e4-ae37-0002a5d54090")
+
+    # A poll after startup sees the last session but it has not been seen to finish
+    await parser._async_poll_client(poll_client(b"\x01"))
+    assert len(store) == 0
+
+    await parser._async_poll_client(poll_client(b"\x02"))
+    parser._notification_handler(brushing_time_char, bytearray(b"\x78\x00"))
+    parser._notification_handler(state_char, bytearray(b"\x01"))
+    await parser._release_task
+    assert len(store) == 1
+    assert store.columns()["duration"].tolist() == [120]
+
+    # Seeing the same session end again does not store it twice
+    parser._notification_handler(state_char, bytearray(b"\x02"))
+    parser._notification_handler(brushing_time_char, bytearray(b"\x0a\x00"))
+    parser._notification_handler(state_char, bytearray(b"\x01"))
+    assert len(store) == 1
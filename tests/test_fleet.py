@@ -0,0 +1,38 @@
+from unittest import mock
+
+from bluetooth_sensor_state_data import BluetoothServiceInfo
+
+from sonicare_ble.fleet import SonicareFleet
+from sonicare_ble.parser import SonicareBluetoothDeviceData
+
+from .test_parser import SONICARE_DATA_1, SONICARE_DATA_2
+
+NOT_SONICARE = BluetoothServiceInfo(
+    name="other",
+    address="AA:BB:CC:DD:EE:FF",
+    rssi=-60,
+    manufacturer_data={},
+    service_uuids=["0000fe95-0000-1000-8000-00805f9b34fb"],
+    service_data={},
+    source="local",
+)
+
+
+def test_update_batch_filters_and_collapses():
+    fleet = SonicareFleet()
+    with mock.patch.object(
+        SonicareBluetoothDeviceData, "update", autospec=True, side_effect=lambda self, info: info
+    ) as update:
+        updates = fleet.update_batch(
+            [SONICARE_DATA_1, NOT_SONICARE, SONICARE_DATA_2, SONICARE_DATA_1]
+        )
+    assert update.call_count == 2
+    assert set(updates) == {SONICARE_DATA_1.address, SONICARE_DATA_2.address}
+    assert len(fleet) == 2
+
+
+def test_update_batch_returns_sensor_updates():
+    fleet = SonicareFleet()
+    updates = fleet.update_batch([SONICARE_DATA_1, SONICARE_DATA_2])
+    assert updates[SONICARE_DATA_1.address].title == "HX992X 70A6"
+    assert fleet.parser(SONICARE_DATA_2.address) is fleet.parser(SONICARE_DATA_2.address)
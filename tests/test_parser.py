@@ -1,7 +1,9 @@
+import asyncio
 from unittest import mock
 
 import pytest
 from bleak import BLEDevice
+from bleak.exc import BleakError
 from bluetooth_sensor_state_data import BluetoothServiceInfo, SensorUpdate
 from sensor_state_data import (
     BinarySensorDescription,
@@ -14,7 +16,12 @@ from sensor_state_data import (
     Units,
 )
 
-from sonicare_ble.parser import SonicareBluetoothDeviceData
+from sonicare_ble.parser import (
+    BrushingState,
+    Models,
+    SonicareBluetoothDeviceData,
+    model_from_model_number,
+)
 
 # 2023-01-29 09:17:16.610 DEBUG (MainThread) [homeassistant.components.bluetooth.manager] badkamerlamp (78:21:84:4f:6d:1c) [connectable]: 24:E5:AA:1A:70:A6 AdvertisementData(local_name='Sonicare4Kids', manufacturer_data={477: b'\x00\x1b\x00\xa6p\x1a\xaa\xe5$'}, service_uuids=['477ea600-a260-11e4-ae37-0002a5d50001'], tx_power=-127, rssi=-61) match: set()
 # 2023-01-29 09:22:16.344 DEBUG (MainThread) [homeassistant.components.bluetooth.manager] badkamerlamp (78:21:84:4f:6d:1c) [connectable]: 24:E5:AA:47:AD:CB AdvertisementData(local_name='Sonicare4Kids', manufacturer_data={477: b'\x00\x1b\x00\xcb\xadG\xaa\xe5$'}, service_uuids=['477ea600-a260-11e4-ae37-0002a5d50001'], tx_power=-127, rssi=-82) match: set()
@@ -296,14 +303,249 @@ def test_poll_needed_no_time():
 
 def test_poll_needed_brushing():
     parser = SonicareBluetoothDeviceData()
-    parser._brushing = True
-    assert parser.poll_needed(None, 61)
+    parser._brushing_state = BrushingState.BRUSHING
+    assert not parser.poll_needed(None, None)
+    assert not parser.poll_needed(None, 61)
 
 
 @mock.patch("sonicare_ble.parser.time")
 def test_poll_needed_brushing_recently(mocked_time):
     parser = SonicareBluetoothDeviceData()
     mocked_time.monotonic.return_value = 5
-    parser._brushing = False
+    parser._brushing_state = BrushingState.RECENTLY_BRUSHED
+    parser._last_brush = 0
+    assert parser.poll_needed(None, 16)
+
+
+@mock.patch("sonicare_ble.parser.time")
+def test_recently_brushed_expires_to_idle(mocked_time):
+    parser = SonicareBluetoothDeviceData()
+    mocked_time.monotonic.return_value = 100
+    parser._brushing_state = BrushingState.RECENTLY_BRUSHED
     parser._last_brush = 0
-    assert parser.poll_needed(None, 61)
+    assert not parser.poll_needed(None, 16)
+    assert parser.brushing_state is BrushingState.IDLE
+
+
+@pytest.mark.asyncio
+async def test_state_notifications_drive_brushing_state():
+    parser = SonicareBluetoothDeviceData()
+    state_char = mock.Mock(uuid="477ea600-a260-11e4-ae37-0002a5d54010")
+    client = mock.AsyncMock()
+    parser._client = client
+
+    parser._notification_handler(state_char, bytearray(b"\x02"))
+    assert parser.brushing_state is BrushingState.BRUSHING
+    parser._notification_handler(state_char, bytearray(b"\x02"))
+    assert parser.brushing_state is BrushingState.BRUSHING
+    client.disconnect.assert_not_called()
+
+    parser._notification_handler(state_char, bytearray(b"\x01"))
+    assert parser.brushing_state is BrushingState.RECENTLY_BRUSHED
+    await parser._release_task
+    client.disconnect.assert_awaited_once()
+    assert parser._client is None
+
+
+def test_disconnect_while_brushing_resumes_polling():
+    parser = SonicareBluetoothDeviceData()
+    client = mock.Mock()
+    parser._client = client
+    parser._brushing_state = BrushingState.BRUSHING
+    parser._disconnected(client)
+    assert parser.brushing_state is BrushingState.RECENTLY_BRUSHED
+    assert parser.poll_needed(None, None)
+
+
+def test_model_from_model_number():
+    assert model_from_model_number("HX9924\x00") is Models.HX992X
+    assert model_from_model_number("HX9990") is Models.HX9990
+    assert model_from_model_number("hx6340") is Models.HX6340
+    assert model_from_model_number("HX1234") is None
+
+
+def test_model_from_local_name():
+    parser = SonicareBluetoothDeviceData()
+    parser.update(
+        BluetoothServiceInfo(
+            name="Sonicare4Kids",
+            address="24:E5:AA:1A:70:A6",
+            rssi=-61,
+            manufacturer_data={},
+            service_uuids=["477ea600-a260-11e4-ae37-0002a5d50001"],
+            service_data={},
+            source="local",
+        )
+    )
+    assert parser.model is Models.HX6340
+    assert not parser._supports("MODE")
+
+
+@pytest.mark.asyncio
+async def test_model_read_once_and_cached():
+    parser = SonicareBluetoothDeviceData()
+    reads = []
+    payloads = {"00002a24-0000-1000-8000-00805f9b34fb": bytearray(b"HX6340")}
+    client = mock.AsyncMock()
+    client.services.get_characteristic = lambda uuid: mock.Mock(uuid=uuid)
+
+    def read_gatt_char(char):
+        reads.append(char.uuid)
+        return payloads.get(char.uuid, bytearray(b"\x01\x00"))
+
+    client.read_gatt_char.side_effect = read_gatt_char
+    await parser._async_poll_client(client)
+    assert parser.model is Models.HX6340
+    assert reads.count("00002a24-0000-1000-8000-00805f9b34fb") == 1
+    assert "477ea600-a260-11e4-ae37-0002a5d54091" not in reads
+
+    reads.clear()
+    await parser._async_poll_client(client)
+    assert "00002a24-0000-1000-8000-00805f9b34fb" not in reads
+
+
+def test_model_passed_in_skips_detection():
+    parser = SonicareBluetoothDeviceData(model=Models.HX9990)
+    assert parser.model_info.device_type == "HX9990"
+
+
+@mock.patch("sonicare_ble.parser.time")
+def test_full_session_keeps_recently_brushed_window(mocked_time):
+    parser = SonicareBluetoothDeviceData()
+    state_char = mock.Mock(uuid="477ea600-a260-11e4-ae37-0002a5d54010")
+    brushing_time_char = mock.Mock(uuid="477ea600-a260-11e4-ae37-0002a5d54090")
+
+    mocked_time.monotonic.return_value = 0
+    parser._notification_handler(state_char, bytearray(b"\x02"))
+    for second in range(1, 120):
+        mocked_time.monotonic.return_value = second
+        parser._notification_handler(brushing_time_char, bytearray(second.to_bytes(2, "little")))
+    mocked_time.monotonic.return_value = 120
+    parser._notification_handler(state_char, bytearray(b"\x01"))
+
+    mocked_time.monotonic.return_value = 121
+    assert parser.poll_needed(None, 16)
+    assert parser.brushing_state is BrushingState.RECENTLY_BRUSHED
+    mocked_time.monotonic.return_value = 141
+    parser.poll_needed(None, 16)
+    assert parser.brushing_state is BrushingState.IDLE
+
+
+@pytest.mark.asyncio
+async def test_brushing_ends_during_poll():
+    parser = SonicareBluetoothDeviceData(model=Models.HX992X)
+    state_char = mock.Mock(uuid="477ea600-a260-11e4-ae37-0002a5d54010")
+    reads = []
+    client = mock.AsyncMock()
+    client.services.get_characteristic = lambda uuid: mock.Mock(uuid=uuid)
+
+    def read_gatt_char(char):
+        reads.append(char.uuid)
+        if char.uuid == "477ea600-a260-11e4-ae37-0002a5d54010":
+            return bytearray(b"\x02")
+        if len(reads) == 2:
+            # The brush is switched off while the poll is still reading
+            parser._notification_handler(state_char, bytearray(b"\x01"))
+        return bytearray(b"\x01\x00")
+
+    client.read_gatt_char.side_effect = read_gatt_char
+    await parser._async_poll_client(client)
+    assert parser.brushing_state is BrushingState.RECENTLY_BRUSHED
+    assert parser._release_task is None
+    assert "477ea600-a260-11e4-ae37-0002a5d54090" in reads
+    client.disconnect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unknown_model_is_not_cached():
+    parser = SonicareBluetoothDeviceData()
+    reads = []
+    client = mock.AsyncMock()
+    client.services.get_characteristic = lambda uuid: mock.Mock(uuid=uuid)
+
+    def read_gatt_char(char):
+        reads.append(char.uuid)
+        if char.uuid == "00002a24-0000-1000-8000-00805f9b34fb":
+            return bytearray(b"HX1234")
+        return bytearray(b"\x01\x00")
+
+    client.read_gatt_char.side_effect = read_gatt_char
+    await parser._async_poll_client(client)
+    assert parser.model is None
+    assert parser.model_info.device_type == "HX992X"
+
+    reads.clear()
+    await parser._async_poll_client(client)
+    assert "00002a24-0000-1000-8000-00805f9b34fb" not in reads
+    assert parser.model is None
+
+
+@pytest.mark.asyncio
+async def test_failed_subscribe_releases_connection():
+    parser = SonicareBluetoothDeviceData(model=Models.HX992X)
+    client = mock.AsyncMock()
+    client.services.get_characteristic = lambda uuid: mock.Mock(uuid=uuid)
+    client.read_gatt_char.return_value = bytearray(b"\x02")
+    client.start_notify.side_effect = [None, TimeoutError("notify failed")]
+
+    with pytest.raises(TimeoutError):
+        await parser._async_poll_client(client)
+    assert parser._client is None
+    client.disconnect.assert_awaited_once()
+
+    parser.update(SONICARE_DATA_1)
+    assert parser.brushing_state is BrushingState.RECENTLY_BRUSHED
+    assert parser.poll_needed(None, None)
+
+
+@pytest.mark.asyncio
+async def test_failed_release_is_logged(caplog):
+    parser = SonicareBluetoothDeviceData()
+    state_char = mock.Mock(uuid="477ea600-a260-11e4-ae37-0002a5d54010")
+    client = mock.AsyncMock()
+    client.disconnect.side_effect = TimeoutError("already gone")
+    parser._client = client
+    parser._notification_handler(state_char, bytearray(b"\x02"))
+
+    with caplog.at_level("DEBUG", logger="sonicare_ble.parser"):
+        parser._notification_handler(state_char, bytearray(b"\x01"))
+        await asyncio.wait([parser._release_task])
+        await asyncio.sleep(0)
+    assert "Failed to disconnect toothbrush: already gone" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_missing_model_characteristic_uses_default():
+    parser = SonicareBluetoothDeviceData()
+    reads = []
+    client = mock.AsyncMock()
+    client.services.get_characteristic = lambda uuid: (
+        None if uuid == "00002a24-0000-1000-8000-00805f9b34fb" else mock.Mock(uuid=uuid)
+    )
+
+    def read_gatt_char(char):
+        reads.append(char.uuid)
+        return bytearray(b"\x01\x00")
+
+    client.read_gatt_char.side_effect = read_gatt_char
+    await parser._async_poll_client(client)
+    await parser._async_poll_client(client)
+    assert parser.model is None
+    assert parser.model_info.device_type == "HX992X"
+    assert "477ea600-a260-11e4-ae37-0002a5d54010" in reads
+
+
+@pytest.mark.asyncio
+async def test_failed_model_read_uses_default():
+    parser = SonicareBluetoothDeviceData()
+    client = mock.AsyncMock()
+    client.services.get_characteristic = lambda uuid: mock.Mock(uuid=uuid)
+
+    def read_gatt_char(char):
+        if char.uuid == "00002a24-0000-1000-8000-00805f9b34fb":
+            raise BleakError("Read not permitted")
+        return bytearray(b"\x01\x00")
+
+    client.read_gatt_char.side_effect = read_gatt_char
+    await parser._async_poll_client(client)
+    assert parser.model is None
@@ -0,0 +1,45 @@
+import json
+import tracemalloc
+
+import pytest
+
+from sonicare_ble.profiling import PHASES, _Simulation, main, profile_memory
+
+
+def test_profile_memory():
+    profile = profile_memory(devices=5, rounds=2, top=3)
+    assert profile.steady_bytes_per_device > 0
+    assert profile.peak_bytes >= profile.steady_bytes
+    assert set(profile.top_sites) == set(PHASES)
+    assert all(len(sites) <= 3 for sites in profile.top_sites.values())
+
+
+def test_profile_memory_rejects_empty_fleet():
+    with pytest.raises(ValueError):
+        profile_memory(devices=0)
+
+
+def test_main_fails_over_budget(capsys):
+    assert main(["--devices", "2", "--rounds", "1", "--max-bytes-per-device", "1"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["devices"] == 2
+    assert main(["--devices", "2", "--rounds", "1"]) == 0
+
+
+def test_profile_memory_leaves_caller_tracing():
+    tracemalloc.start()
+    try:
+        profile_memory(devices=2, rounds=1, top=1)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_profile_memory_stops_tracing_on_error(monkeypatch):
+    async def fail(self):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(_Simulation, "run_round", fail)
+    with pytest.raises(RuntimeError):
+        profile_memory(devices=2, rounds=1)
+    assert not tracemalloc.is_tracing()
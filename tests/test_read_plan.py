@@ -0,0 +1,85 @@
+from unittest import mock
+
+import pytest
+
+from sonicare_ble.parser import Models, SonicareBluetoothDeviceData
+from sonicare_ble.read_plan import ReadPlan
+
+BATTERY_UUID = "00002a19-0000-1000-8000-00805f9b34fb"
+SESSION_ID_UUID = "477ea600-a260-11e4-ae37-0002a5d54070"
+SERIAL_NUMBER_UUID = "477ea600-a260-11e4-ae37-0002a5d54230"
+BRUSH_USAGE_UUID = "477ea600-a260-11e4-ae37-0002a5d54290"
+
+
+def test_interval_backs_off_while_unchanged():
+    plan = ReadPlan(min_interval=30, max_interval=100, prefetch=0)
+    plan.observe("BATTERY", "IDLE", b"\x3b", now=0)
+    assert not plan.due("BATTERY", "IDLE", now=29)
+    assert plan.due("BATTERY", "IDLE", now=30)
+    plan.observe("BATTERY", "IDLE", b"\x3b", now=30)
+    plan.observe("BATTERY", "IDLE", b"\x3b", now=90)
+    stats = plan.stats()[("BATTERY", "IDLE")]
+    assert stats.interval == 100
+    assert stats.change_rate == 0
+
+    plan.observe("BATTERY", "IDLE", b"\x3a", now=190)
+    assert stats.interval == 30
+    assert stats.changes == 1
+
+
+def test_stats_are_kept_per_state():
+    plan = ReadPlan(prefetch=0)
+    plan.observe("BATTERY", "IDLE", b"\x3b", now=0)
+    assert plan.due("BATTERY", "RECENTLY_BRUSHED", now=0)
+    assert not plan.due("BATTERY", "IDLE", now=0)
+
+
+def test_prefetch_reads_due_soon():
+    plan = ReadPlan(min_interval=30, prefetch=15)
+    plan.observe("BATTERY", "IDLE", b"\x3b", now=0)
+    assert not plan.due("BATTERY", "IDLE", now=14)
+    assert plan.due("BATTERY", "IDLE", now=15)
+
+
+def test_clock_is_used_without_now():
+    now = [0.0]
+    plan = ReadPlan(min_interval=30, prefetch=0, clock=lambda: now[0])
+    plan.observe("BATTERY", "IDLE", b"\x3b")
+    now[0] = 29
+    assert not plan.due("BATTERY", "IDLE")
+    now[0] = 30
+    assert plan.due("BATTERY", "IDLE")
+
+
+@pytest.mark.asyncio
+async def test_poll_skips_reads_that_rarely_change():
+    now = [0.0]
+    parser = SonicareBluetoothDeviceData(model=Models.HX992X)
+    parser.set_clock(lambda: now[0])
+    reads = []
+    client = mock.AsyncMock()
+    client.services.get_characteristic = lambda uuid: mock.Mock(uuid=uuid)
+
+    def read_gatt_char(char):
+        reads.append(char.uuid)
+        # A new session every poll, with the brush head wearing down
+        if char.uuid == SESSION_ID_UUID:
+            return bytearray(int(now[0]).to_bytes(2, "little"))
+        if char.uuid == BRUSH_USAGE_UUID:
+            return bytearray(int(now[0]).to_bytes(4, "little"))
+        return bytearray(b"\x01\x00")
+
+    client.read_gatt_char.side_effect = read_gatt_char
+    await parser._async_poll_client(client)
+    first_poll_reads = len(reads)
+
+    for t in (30, 60):
+        now[0] = t
+        reads.clear()
+        await parser._async_poll_client(client)
+    assert BATTERY_UUID not in reads
+    assert SERIAL_NUMBER_UUID not in reads
+    assert BRUSH_USAGE_UUID in reads
+    assert len(reads) < first_poll_reads
+    assert parser.read_plan.polls == 3
+    assert parser.read_plan.reads_per_poll < first_poll_reads
@@ -0,0 +1,94 @@
+from unittest import mock
+
+import pytest
+
+from sonicare_ble.parser import BrushingState, SonicareBluetoothDeviceData
+from sonicare_ble.status_table import (
+    StatusTableError,
+    StatusTableReader,
+    StatusTableWriter,
+)
+
+ADDRESS = "24:E5:AA:1A:70:A6"
+
+
+def test_write_and_read_rows(tmp_path):
+    path = str(tmp_path / "status")
+    writer = StatusTableWriter(path, rows=2)
+    reader = StatusTableReader(path)
+    assert reader.snapshots() == []
+
+    writer.update(ADDRESS, battery=59, toothbrush_state=1)
+    writer.update(ADDRESS, brushing_time=45)
+    status = reader.snapshot(ADDRESS.lower())
+    assert status.battery == 59
+    assert status.toothbrush_state == 1
+    assert status.brushing_time == 45
+    assert status.session_id is None
+    assert status.seq == 4
+
+    writer.update("24:E5:AA:47:AD:CB", battery=10)
+    with pytest.raises(StatusTableError):
+        writer.update("24:E5:AA:00:00:00", battery=10)
+    assert [status.address for status in reader.snapshots()] == [
+        ADDRESS,
+        "24:E5:AA:47:AD:CB",
+    ]
+    reader.close()
+    writer.close()
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "status"
+    path.write_bytes(bytes(64))
+    with pytest.raises(StatusTableError):
+        StatusTableReader(str(path))
+
+
+def test_notifications_are_exported(tmp_path):
+    path = str(tmp_path / "status")
+    writer = StatusTableWriter(path, rows=1)
+    parser = SonicareBluetoothDeviceData()
+    parser._address = ADDRESS
+    parser.set_status_exporter(writer)
+    parser._notification_handler(
+        mock.Mock(uuid="477ea600-a260-11e4-ae37-0002a5d54010"), bytearray(b"\x02")
+    )
+    status = StatusTableReader(path).snapshot(ADDRESS)
+    assert status.toothbrush_state == 2
+    assert status.brushing_state == BrushingState.BRUSHING.value
+
+
+def test_rejects_addresses_that_are_not_macs(tmp_path):
+    writer = StatusTableWriter(str(tmp_path / "status"), rows=2)
+    for address in ("5B2F1E8C-1D4A-4E0A-9C5B-3F6A7E2B1C0D", "24:E5:AA:1A:70:A6:00:01"):
+        with pytest.raises(StatusTableError):
+            writer.update(address, battery=10)
+    writer.close()
+
+
+def test_export_errors_do_not_fail_updates(tmp_path, caplog):
+    writer = StatusTableWriter(str(tmp_path / "status"), rows=1)
+    writer.update("24:E5:AA:47:AD:CB", battery=10)
+    parser = SonicareBluetoothDeviceData()
+    parser._address = ADDRESS
+    parser.set_status_exporter(writer)
+    state_char = mock.Mock(uuid="477ea600-a260-11e4-ae37-0002a5d54010")
+    parser._notification_handler(state_char, bytearray(b"\x01"))
+    parser._notification_handler(state_char, bytearray(b"\x02"))
+    assert parser.brushing_state is BrushingState.BRUSHING
+    assert "Status table is full" in caplog.text
+
+
+def test_brushing_state_changes_are_exported(tmp_path):
+    path = str(tmp_path / "status")
+    writer = StatusTableWriter(path, rows=1)
+    parser = SonicareBluetoothDeviceData()
+    parser._address = ADDRESS
+    parser.set_status_exporter(writer)
+    client = mock.Mock()
+    parser._client = client
+    parser._brushing_state = BrushingState.BRUSHING
+    parser._disconnected(client)
+    status = StatusTableReader(path).snapshot(ADDRESS)
+    assert status.brushing_state == BrushingState.RECENTLY_BRUSHED.value
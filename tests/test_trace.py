@@ -0,0 +1,152 @@
+import io
+from unittest import mock
+
+import pytest
+from bleak import BLEDevice
+
+from sonicare_ble.parser import BrushingState, SonicareBluetoothDeviceData
+from sonicare_ble.trace import (
+    TraceRecorder,
+    TraceReplayer,
+    iter_trace,
+    record_to_service_info,
+    service_info_to_record,
+)
+
+from .test_parser import SONICARE_DATA_1
+
+STATE_UUID = "477ea600-a260-11e4-ae37-0002a5d54010"
+
+POLL_READS = {
+    "00002a24-0000-1000-8000-00805f9b34fb": bytearray(b"HX9924"),
+    "477ea600-a260-11e4-ae37-0002a5d54010": bytearray(b"\x01"),
+    "00002a19-0000-1000-8000-00805f9b34fb": bytearray(b"\x3b"),
+    "477ea600-a260-11e4-ae37-0002a5d54050": bytearray(b"\x00\x00\x00\x00"),
+    "477ea600-a260-11e4-ae37-0002a5d54070": bytearray(b"\x07\x00"),
+    "477ea600-a260-11e4-ae37-0002a5d54230": bytearray(b"\x01\x02"),
+    "477ea600-a260-11e4-ae37-0002a5d54290": bytearray(b"\x10\x00"),
+    "477ea600-a260-11e4-ae37-0002a5d54280": bytearray(b"\x40\x00"),
+    "477ea600-a260-11e4-ae37-0002a5d54091": bytearray(b"\x78"),
+    "477ea600-a260-11e4-ae37-0002a5d540b0": bytearray(b"\x01"),
+    "477ea600-a260-11e4-ae37-0002a5d54090": bytearray(b"\x2d\x00"),
+}
+
+
+def _mock_client():
+    client = mock.AsyncMock()
+    client.services.get_characteristic = lambda uuid: mock.Mock(uuid=uuid)
+    client.read_gatt_char.side_effect = lambda char: POLL_READS[char.uuid]
+    return client
+
+
+def test_service_info_round_trip():
+    service_info = record_to_service_info(service_info_to_record(SONICARE_DATA_1))
+    assert service_info.address == SONICARE_DATA_1.address
+    assert service_info.rssi == SONICARE_DATA_1.rssi
+    assert service_info.manufacturer_data == SONICARE_DATA_1.manufacturer_data
+    assert service_info.service_uuids == SONICARE_DATA_1.service_uuids
+
+
+@mock.patch("sonicare_ble.parser.establish_connection")
+@pytest.mark.asyncio
+async def test_record_and_replay(mock_establish_connection):
+    mock_establish_connection.return_value = _mock_client()
+    fp = io.StringIO()
+    recorder = TraceRecorder(fp)
+    parser = SonicareBluetoothDeviceData()
+    parser.set_trace_recorder(recorder)
+
+    parser.update(SONICARE_DATA_1)
+    recorded_poll = await parser.async_poll(
+        BLEDevice(address=SONICARE_DATA_1.address, name=None, details=None)
+    )
+    parser._notification_handler(mock.Mock(uuid=STATE_UUID), bytearray(b"\x02"))
+
+    records = list(iter_trace(io.StringIO(fp.getvalue())))
+    assert [record["type"] for record in records] == (
+        ["adv", "poll"] + ["read"] * len(POLL_READS) + ["poll_end", "notify"]
+    )
+    assert {record["poll"] for record in records if record["type"] == "read"} == {1}
+
+    replayed = SonicareBluetoothDeviceData()
+    updates = await TraceReplayer(records).replay(replayed)
+    assert len(updates) == 3
+    assert updates[1].entity_values == recorded_poll.entity_values
+    assert replayed.brushing_state is BrushingState.BRUSHING
+
+
+@mock.patch("sonicare_ble.parser.establish_connection")
+@pytest.mark.asyncio
+async def test_replay_notification_between_reads(mock_establish_connection):
+    client = _mock_client()
+    parser = SonicareBluetoothDeviceData()
+    brushing_reads = dict(POLL_READS)
+    brushing_reads[STATE_UUID] = bytearray(b"\x02")
+
+    def read_gatt_char(char):
+        if char.uuid == "00002a19-0000-1000-8000-00805f9b34fb":
+            parser._notification_handler(mock.Mock(uuid=STATE_UUID), bytearray(b"\x02"))
+        return brushing_reads[char.uuid]
+
+    client.read_gatt_char.side_effect = read_gatt_char
+    mock_establish_connection.return_value = client
+    fp = io.StringIO()
+    parser.set_trace_recorder(TraceRecorder(fp))
+    await parser.async_poll(
+        BLEDevice(address=SONICARE_DATA_1.address, name=None, details=None)
+    )
+
+    records = list(iter_trace(io.StringIO(fp.getvalue())))
+    types = [record["type"] for record in records]
+    assert types.index("notify") < types.index("poll_end")
+
+    replayed = SonicareBluetoothDeviceData()
+    updates = await TraceReplayer(records).replay(replayed)
+    assert len(updates) == 2
+    assert replayed.brushing_state is BrushingState.BRUSHING
+
+
+@mock.patch("sonicare_ble.parser.establish_connection")
+@pytest.mark.asyncio
+async def test_replay_failed_poll(mock_establish_connection):
+    mock_establish_connection.side_effect = TimeoutError("out of range")
+    fp = io.StringIO()
+    parser = SonicareBluetoothDeviceData()
+    parser.set_trace_recorder(TraceRecorder(fp))
+    parser.update(SONICARE_DATA_1)
+    with pytest.raises(TimeoutError):
+        await parser.async_poll(
+            BLEDevice(address=SONICARE_DATA_1.address, name=None, details=None)
+        )
+    parser.update(SONICARE_DATA_1)
+
+    records = list(iter_trace(io.StringIO(fp.getvalue())))
+    assert records[2] == {"t": records[2]["t"], "type": "poll_end", "poll": 1, "error": "out of range"}
+
+    updates = await TraceReplayer(records).replay(SonicareBluetoothDeviceData())
+    assert len(updates) == 2
+
+
+@mock.patch("sonicare_ble.parser.establish_connection")
+@pytest.mark.asyncio
+async def test_replay_uses_recorded_time(mock_establish_connection):
+    mock_establish_connection.return_value = _mock_client()
+    now = [0.0]
+    fp = io.StringIO()
+    parser = SonicareBluetoothDeviceData()
+    parser.set_clock(lambda: now[0])
+    parser.set_trace_recorder(TraceRecorder(fp, clock=lambda: now[0]))
+    device = BLEDevice(address=SONICARE_DATA_1.address, name=None, details=None)
+    for t in (0, 30, 60, 100, 200):
+        now[0] = t
+        parser.update(SONICARE_DATA_1)
+        await parser.async_poll(device)
+
+    records = list(iter_trace(io.StringIO(fp.getvalue())))
+    recorded_reads = sum(record["type"] == "read" for record in records)
+    assert recorded_reads == parser.read_plan.reads
+
+    replayed = SonicareBluetoothDeviceData()
+    await TraceReplayer(records).replay(replayed)
+    assert replayed.read_plan.reads == recorded_reads
+    assert replayed.read_plan.stats() == parser.read_plan.stats()